@@ -10,8 +10,16 @@ from .config import (
     OUTPUT_SHEET_NAME_SINGLE_LANG,
 )
 
-from .transformer import process_workbook
-from .validator import validate_output
+from .cache import SectionResultCache, SheetCache
+from .reader import WorkbookSession, open_workbook
+from .results import PlatformPartition, partition_by_platform
+from .transformer import (
+    iter_transformed_batches,
+    iter_transformed_records,
+    process_and_validate,
+    process_workbook,
+)
+from .validator import validate_details, validate_output, validate_results
 
 __all__ = [
     "APP_NAME",
@@ -21,6 +29,17 @@ __all__ = [
     "OUTPUT_FILE_BASENAME",
     "OUTPUT_SHEET_NAME_DUAL_LANG",
     "OUTPUT_SHEET_NAME_SINGLE_LANG",
+    "SectionResultCache",
+    "SheetCache",
+    "WorkbookSession",
+    "open_workbook",
+    "PlatformPartition",
+    "partition_by_platform",
+    "iter_transformed_batches",
+    "iter_transformed_records",
+    "process_and_validate",
     "process_workbook",
+    "validate_details",
     "validate_output",
+    "validate_results",
 ]
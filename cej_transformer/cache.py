@@ -0,0 +1,277 @@
+"""Caches keyed by content: parsed tracker sheets per workbook and transformed sections."""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Optional, Union
+
+import pandas as pd
+
+from . import config
+
+
+logger = logging.getLogger(__name__)
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+_VERSION_DIR_PREFIX = "sheets-"
+# Fixed so section fingerprints stay stable across Python versions.
+_FINGERPRINT_PICKLE_PROTOCOL = 4
+
+
+def workbook_digest(source: Union[str, Path, bytes, bytearray, memoryview, BinaryIO]) -> str:
+    """Return the SHA-256 hex digest of a workbook given as a path, buffer or binary stream.
+
+    Streams are rewound to where they started so they can be parsed afterwards.
+    """
+
+    digest = hashlib.sha256()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        digest.update(source)
+    elif hasattr(source, "getbuffer"):
+        with source.getbuffer() as view:
+            digest.update(view)
+    elif hasattr(source, "read"):
+        start = source.tell()
+        for chunk in iter(lambda: source.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+        source.seek(start)
+    else:
+        with open(source, "rb") as handle:
+            for chunk in iter(lambda: handle.read(_HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def config_fingerprint() -> str:
+    """Short digest of the package version and the settings that shape transformed output.
+
+    Cached results keyed on it are invalidated whenever the parsing or expansion rules change.
+    """
+
+    settings = (
+        config.VERSION,
+        config.START_ROW_SEARCH_FOR_PLATFORM,
+        config.SUB_HEADER_ROW_OFFSET,
+        config.DATA_START_ROW_OFFSET,
+        sorted(config.PLATFORM_NAMES.items()),
+        config.FUNNEL_STAGES,
+        config.EXPAND_ALL_TO_ACP,
+        sorted(config.PLATFORMS_WITH_FORMAT_TYPES),
+        sorted(config.FORMAT_TYPE_TO_ASPECT_RATIO.items()),
+        config.SHEET_SPECS,
+    )
+    return hashlib.sha256(repr(settings).encode("utf-8")).hexdigest()[:16]
+
+
+class SheetCache:
+    """Content-addressed pickle store of raw sheet grids with size-based LRU eviction.
+
+    Entries live under ``<directory>/sheets-<VERSION>/<digest>.<engine>.pkl`` so upgrading
+    the package invalidates everything written by earlier versions, and grids parsed by one
+    reader engine are never served to another. Cache failures are logged and treated as
+    misses, so callers always fall back to parsing the workbook.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path] = config.SHEET_CACHE_DIR,
+        *,
+        max_bytes: int = config.SHEET_CACHE_MAX_BYTES,
+    ) -> None:
+        self.root = Path(directory)
+        self.directory = self.root / f"{_VERSION_DIR_PREFIX}{config.VERSION}"
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._drop_stale_versions()
+
+    def get(
+        self, digest: str, sheet_names: Iterable[str], *, engine: str
+    ) -> Optional[Dict[str, Optional[pd.DataFrame]]]:
+        """Return grids parsed by ``engine`` for ``digest`` if every requested sheet was stored."""
+
+        entry_path = self._entry_path(digest, engine)
+        try:
+            with open(entry_path, "rb") as handle:
+                sheets = pickle.load(handle)
+            os.utime(entry_path)
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            logger.warning("Discarding unreadable cache entry %s: %s", entry_path.name, exc)
+            entry_path.unlink(missing_ok=True)
+            return None
+
+        if any(name not in sheets for name in sheet_names):
+            return None
+
+        logger.info("Sheet cache hit for %s", digest[:12])
+        return sheets
+
+    def put(self, digest: str, sheets: Dict[str, Optional[pd.DataFrame]], *, engine: str) -> None:
+        entry_path = self._entry_path(digest, engine)
+        try:
+            # A private temp file per writer, so concurrent puts of one digest cannot collide.
+            handle, temp_name = tempfile.mkstemp(dir=self.directory, prefix=f"{entry_path.name}.", suffix=".tmp")
+            try:
+                with os.fdopen(handle, "wb") as stream:
+                    pickle.dump(sheets, stream, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_name, entry_path)
+            except BaseException:
+                Path(temp_name).unlink(missing_ok=True)
+                raise
+            self._evict()
+        except Exception as exc:
+            logger.warning("Could not write sheet cache entry %s: %s", entry_path.name, exc)
+
+    def _entry_path(self, digest: str, engine: str) -> Path:
+        return self.directory / f"{digest}.{engine}.pkl"
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self.directory.glob("*.pkl"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # removed by a concurrent writer
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort(key=lambda entry: entry[0])
+        total = sum(size for _, size, _ in entries)
+        while entries and total > self.max_bytes:
+            _, size, oldest = entries.pop(0)
+            total -= size
+            oldest.unlink(missing_ok=True)
+            logger.info("Evicted sheet cache entry %s", oldest.name)
+
+    def _drop_stale_versions(self) -> None:
+        # Only directories this cache created are removed; anything else under root is left alone.
+        for child in self.root.iterdir():
+            if child.is_dir() and child.name.startswith(_VERSION_DIR_PREFIX) and child != self.directory:
+                shutil.rmtree(child, ignore_errors=True)
+
+
+def section_fingerprint(section: Any, section_rows: pd.DataFrame, *, variant: str = "") -> str:
+    """Digest of one platform section's cell block and header layout.
+
+    ``section`` is a :class:`~cej_transformer.parser.PlatformSection`; its absolute row
+    positions are left out, so inserting or deleting rows above a section keeps its
+    fingerprint. Cells are hashed with their Python types, so ``1``, ``1.0`` and ``"1"``
+    differ. ``variant`` separates outputs of different transformation options.
+    """
+
+    layout = dataclasses.replace(section, data_row_start=0, data_row_end=0)
+    digest = hashlib.sha256(repr((variant, layout)).encode("utf-8"))
+    cells = section_rows.to_numpy(dtype=object).tolist()
+    digest.update(pickle.dumps(cells, protocol=_FINGERPRINT_PICKLE_PROTOCOL))
+    return digest.hexdigest()
+
+
+class SectionResultCache:
+    """In-memory LRU of per-section transformation outputs keyed by :func:`section_fingerprint`.
+
+    Bounded by ``max_entries`` and by ``max_bytes`` of pickled entry size.
+
+    Passing one to ``process_workbook(section_cache=...)`` makes re-runs incremental: only
+    sections whose fingerprint changed since an earlier run are transformed again. Use
+    :meth:`save` and :meth:`load` to keep the entries between processes.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = config.SECTION_CACHE_MAX_ENTRIES,
+        *,
+        max_bytes: int = config.SECTION_CACHE_MAX_BYTES,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        """Pickled size of all entries, the measure ``max_bytes`` bounds."""
+
+        return self._total_bytes
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: Any) -> None:
+        size = len(pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL))
+        with self._lock:
+            self._discard(key)
+            if size > self.max_bytes:
+                logger.debug("Section output of %d bytes exceeds the cache limit; not cached", size)
+                return
+            self._entries[key] = entry
+            self._sizes[key] = size
+            self._total_bytes += size
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+
+    def _discard(self, key: str) -> None:
+        if self._entries.pop(key, None) is not None:
+            self._total_bytes -= self._sizes.pop(key)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Pickle the entries to ``path``, replacing it atomically."""
+
+        path = Path(path)
+        with self._lock:
+            entries = dict(self._entries)
+        handle, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as stream:
+                pickle.dump((config.VERSION, entries), stream, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_name, path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
+    @classmethod
+    def load(
+        cls,
+        path: Union[str, Path],
+        *,
+        max_entries: int = config.SECTION_CACHE_MAX_ENTRIES,
+        max_bytes: int = config.SECTION_CACHE_MAX_BYTES,
+    ) -> "SectionResultCache":
+        """Entries saved by :meth:`save`; empty when ``path`` is missing, unreadable or stale."""
+
+        cache = cls(max_entries, max_bytes=max_bytes)
+        path = Path(path)
+        if not path.exists():
+            return cache
+        try:
+            with open(path, "rb") as handle:
+                version, entries = pickle.load(handle)
+        except Exception as exc:
+            logger.warning("Ignoring unreadable section cache %s: %s", path, exc)
+            return cache
+        if version != config.VERSION:
+            logger.info("Ignoring section cache %s written by version %s", path, version)
+            return cache
+        for key, entry in entries.items():
+            cache.put(key, entry)
+        return cache
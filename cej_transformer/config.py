@@ -28,6 +28,14 @@ OUTPUT_COLUMNS_BASE: List[str] = [
     "Aspect Ratio / Format",
 ]
 OUTPUT_LANGUAGE_COLUMN = "Languages"
+OUTPUT_QUANTITY_COLUMN = "Quantity"
+
+# "rows" emits one row per creative; "quantity" emits each distinct combination once with
+# a Quantity column holding how many creatives it stands for.
+OUTPUT_MODE_ROWS = "rows"
+OUTPUT_MODE_QUANTITY = "quantity"
+OUTPUT_MODES = (OUTPUT_MODE_ROWS, OUTPUT_MODE_QUANTITY)
+DEFAULT_OUTPUT_MODE = OUTPUT_MODE_ROWS
 
 FUNNEL_STAGE_HEADER = "Funnel Stage"
 FORMAT_HEADER = "Format"
@@ -38,6 +46,103 @@ MAIN_HEADER_ASPECT_RATIO_GROUP_SECONDARY = "Format"
 MAIN_HEADER_LANGUAGES_GROUP = "Languages"
 MAIN_HEADER_TOTAL_COL = "TOTAL"
 
+# "frame" loads each tracker sheet into a DataFrame; "stream" walks rows through a
+# read-only openpyxl handle and only keeps one platform section in memory at a time.
+READER_BACKEND_FRAME = "frame"
+READER_BACKEND_STREAM = "stream"
+READER_BACKENDS = (READER_BACKEND_FRAME, READER_BACKEND_STREAM)
+DEFAULT_READER_BACKEND = READER_BACKEND_FRAME
+
+# Engines used to parse workbooks for the "frame" backend. "auto" prefers the Rust-based
+# calamine engine when python-calamine is installed and falls back to openpyxl.
+READER_ENGINE_AUTO = "auto"
+READER_ENGINE_CALAMINE = "calamine"
+READER_ENGINE_OPENPYXL = "openpyxl"
+READER_ENGINES = (READER_ENGINE_AUTO, READER_ENGINE_CALAMINE, READER_ENGINE_OPENPYXL)
+DEFAULT_READER_ENGINE = READER_ENGINE_AUTO
+
+# "vectorized" builds output columns with NumPy repeat counts; "records" is the original
+# one-dict-per-row expansion and is kept as the reference implementation.
+EXPANSION_ENGINE_VECTORIZED = "vectorized"
+EXPANSION_ENGINE_RECORDS = "records"
+EXPANSION_ENGINES = (EXPANSION_ENGINE_VECTORIZED, EXPANSION_ENGINE_RECORDS)
+DEFAULT_EXPANSION_ENGINE = EXPANSION_ENGINE_VECTORIZED
+
+# How the sections of one sheet are transformed. "thread" and "process" hand sections to a
+# worker pool and concatenate the results in section order; "auto" uses threads for the
+# vectorized expansion and processes for the pure-Python records expansion. Sheets with
+# fewer sections or data rows than the thresholds below (or hosts with one CPU) stay serial.
+SECTION_EXECUTOR_SERIAL = "serial"
+SECTION_EXECUTOR_THREAD = "thread"
+SECTION_EXECUTOR_PROCESS = "process"
+SECTION_EXECUTOR_AUTO = "auto"
+SECTION_EXECUTORS = (
+    SECTION_EXECUTOR_SERIAL,
+    SECTION_EXECUTOR_THREAD,
+    SECTION_EXECUTOR_PROCESS,
+    SECTION_EXECUTOR_AUTO,
+)
+DEFAULT_SECTION_EXECUTOR = SECTION_EXECUTOR_SERIAL
+SECTION_POOL_MIN_SECTIONS = 4
+SECTION_POOL_MIN_ROWS = 20_000
+
+# Output frames at least this long store their text columns as pandas Categoricals unless
+# the caller asks otherwise; repeated labels then cost one small integer code per row.
+CATEGORICAL_OUTPUT_MIN_ROWS = 100_000
+
+# Excel writer engines. "auto" prefers xlsxwriter in constant_memory mode when installed
+# and falls back to openpyxl.
+WRITER_ENGINE_AUTO = "auto"
+WRITER_ENGINE_XLSXWRITER = "xlsxwriter"
+WRITER_ENGINE_OPENPYXL = "openpyxl"
+WRITER_ENGINES = (WRITER_ENGINE_AUTO, WRITER_ENGINE_XLSXWRITER, WRITER_ENGINE_OPENPYXL)
+DEFAULT_WRITER_ENGINE = WRITER_ENGINE_AUTO
+
+# Worksheet capacity including the header row. Larger outputs roll over into numbered
+# sheets (Transformed_Dual_Lang_1, _2, ...) unless rollover is disabled.
+EXCEL_MAX_ROWS = 1_048_576
+EXCEL_MAX_SHEET_NAME_LENGTH = 31
+
+# Output file formats. Everything but xlsx writes one file per output sheet into a
+# timestamped directory; parquet and feather need pyarrow.
+OUTPUT_FORMAT_XLSX = "xlsx"
+OUTPUT_FORMAT_PARQUET = "parquet"
+OUTPUT_FORMAT_CSV = "csv"
+OUTPUT_FORMAT_FEATHER = "feather"
+OUTPUT_FORMATS = (OUTPUT_FORMAT_XLSX, OUTPUT_FORMAT_PARQUET, OUTPUT_FORMAT_CSV, OUTPUT_FORMAT_FEATHER)
+DEFAULT_OUTPUT_FORMAT = OUTPUT_FORMAT_XLSX
+OUTPUT_FORMAT_SUFFIXES: Dict[str, str] = {
+    OUTPUT_FORMAT_PARQUET: ".parquet",
+    OUTPUT_FORMAT_CSV: ".csv",
+    OUTPUT_FORMAT_FEATHER: ".arrow",
+}
+
+# Compression codecs for parquet and feather output ("none" writes uncompressed files).
+# Feather (Arrow IPC) only supports lz4 and zstd, hence the zstd default.
+OUTPUT_COMPRESSIONS = ("zstd", "snappy", "gzip", "brotli", "lz4", "none")
+DEFAULT_OUTPUT_COMPRESSION = "zstd"
+FEATHER_COMPRESSIONS = ("lz4", "zstd", "none")
+
+# Rows per DataFrame yielded by transformer.iter_transformed_batches.
+DEFAULT_BATCH_SIZE = 50_000
+
+SHEET_CACHE_DIR = ".cej_cache"
+SHEET_CACHE_MAX_BYTES = 512 * 1024 * 1024  # evict least recently used entries past 512MB
+
+# Bounds for the Streamlit app's in-memory cache of transformation results and download
+# payloads, shared by every session on the server.
+STREAMLIT_CACHE_MAX_ENTRIES = 16
+STREAMLIT_CACHE_TTL_SECONDS = 60 * 60
+# Read and transform each SHEET_SPECS sheet of an upload in its own worker process. Off by
+# default: it copies the upload into every worker and pool start-up outweighs the gain on
+# typical trackers.
+STREAMLIT_PARALLEL_SHEETS = False
+
+# Per-section outputs kept by cache.SectionResultCache for incremental re-runs, bounded by
+# entry count and by their total pickled size.
+SECTION_CACHE_MAX_ENTRIES = 10_000
+SECTION_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
 START_ROW_SEARCH_FOR_PLATFORM = 7
 SUB_HEADER_ROW_OFFSET = 3
 DATA_START_ROW_OFFSET = 4
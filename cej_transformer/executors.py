@@ -0,0 +1,156 @@
+"""Process and thread pools for transforming sheets and sections concurrently."""
+
+from __future__ import annotations
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+from . import config
+from .cache import SheetCache, workbook_digest
+from .parser import CoercionIssue, PlatformSection
+from .reader import WorkbookSession, WorkbookSource, as_portable_source, open_workbook, resolve_engine, source_name
+
+
+logger = logging.getLogger(__name__)
+
+
+def process_sheets_in_workers(
+    workers: int,
+    excel_path: WorkbookSource,
+    specs: Sequence[config.SheetSpecification],
+    *,
+    process_sheets: Callable[..., Tuple[Dict[str, Optional[pd.DataFrame]], str]],
+    reader_backend: str,
+    engine: str,
+    cache: Optional[SheetCache],
+    expected_totals: Optional[Dict[str, Dict[str, int]]],
+    options: Dict[str, object],
+) -> Dict[str, Optional[pd.DataFrame]]:
+    """Process each sheet spec in a pool of ``workers`` processes; results keep spec order.
+
+    Each worker calls ``process_sheets`` (a module-level function, so it pickles by name)
+    with ``specs=[spec]`` and the serial options; it returns ``(results, input_name)``.
+
+    Workers get a picklable source: the path, the workbook bytes, or just their own sheet
+    grid when ``excel_path`` is a loaded session or the sheet cache already holds it. Grids
+    parsed by workers on a cache miss are sent back and stored in ``cache`` by this process,
+    so workers never write cache entries concurrently.
+    """
+    sheet_names = [spec.sheet_name for spec in specs]
+    grids: Optional[Dict[str, Optional[pd.DataFrame]]] = None
+    digest = None
+    if isinstance(excel_path, WorkbookSession):
+        grids = {name: excel_path.sheet(name) for name in sheet_names}
+    elif cache is not None and reader_backend == config.READER_BACKEND_FRAME:
+        digest = workbook_digest(excel_path)
+        grids = cache.get(digest, sheet_names, engine=resolve_engine(engine))
+
+    if grids is not None and reader_backend == config.READER_BACKEND_FRAME:
+        name = excel_path.name if isinstance(excel_path, WorkbookSession) else source_name(excel_path)
+        sources = [WorkbookSession(name, {spec.sheet_name: grids[spec.sheet_name]}) for spec in specs]
+    else:
+        source = excel_path.source if isinstance(excel_path, WorkbookSession) else excel_path
+        sources = [as_portable_source(source)] * len(specs)
+
+    return_grids = digest is not None and grids is None
+    logger.info("Processing %d sheets in %d worker processes", len(specs), workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                _process_sheet_worker,
+                sheet_source,
+                spec,
+                process_sheets=process_sheets,
+                reader_backend=reader_backend,
+                engine=engine,
+                track_totals=expected_totals is not None,
+                return_grid=return_grids,
+                options=options,
+            )
+            for sheet_source, spec in zip(sources, specs)
+        ]
+        outcomes = [future.result() for future in futures]
+
+    results: Dict[str, Optional[pd.DataFrame]] = {}
+    parsed: Dict[str, Optional[pd.DataFrame]] = {}
+    for spec, (frame, totals, grid) in zip(specs, outcomes):
+        results[spec.sheet_name] = frame
+        if expected_totals is not None and totals is not None:
+            expected_totals[spec.sheet_name] = totals
+        parsed[spec.sheet_name] = grid
+    if return_grids:
+        cache.put(digest, parsed, engine=resolve_engine(engine))
+    return results
+
+
+def _process_sheet_worker(
+    source: Union[str, Path, bytes, WorkbookSession],
+    spec: config.SheetSpecification,
+    *,
+    process_sheets: Callable[..., Tuple[Dict[str, Optional[pd.DataFrame]], str]],
+    reader_backend: str,
+    engine: str,
+    track_totals: bool,
+    return_grid: bool,
+    options: Dict[str, object],
+) -> Tuple[Optional[pd.DataFrame], Optional[Dict[str, int]], Optional[pd.DataFrame]]:
+    # Runs in a worker process: parse (only this sheet) and transform it.
+    if reader_backend == config.READER_BACKEND_FRAME:
+        source = open_workbook(source, engine=engine, sheet_names=[spec.sheet_name])
+    expected_totals: Optional[Dict[str, Dict[str, int]]] = {} if track_totals else None
+    results, _ = process_sheets(
+        source,
+        reader_backend=reader_backend,
+        engine=engine,
+        cache=None,
+        expected_totals=expected_totals,
+        specs=[spec],
+        **options,
+    )
+    totals = expected_totals.get(spec.sheet_name) if expected_totals is not None else None
+    grid = source.sheet(spec.sheet_name) if return_grid else None
+    return results[spec.sheet_name], totals, grid
+
+
+def run_section_blocks(
+    blocks: Iterable[Tuple[PlatformSection, pd.DataFrame]], transform, *, expansion: str, executor: str
+) -> Iterable[Tuple[object, List[CoercionIssue]]]:
+    """Apply ``transform`` to ``blocks`` serially or in a pool, keeping section order.
+
+    The serial executor consumes ``blocks`` lazily; the pooled ones materialize the sheet's
+    blocks first so the size heuristic can look at them.
+    """
+    if executor == config.SECTION_EXECUTOR_SERIAL:
+        return map(transform, blocks)
+
+    blocks = list(blocks)
+    workers = min(len(blocks), os.cpu_count() or 1)
+    data_rows = sum(len(section_rows) for _, section_rows in blocks)
+    if (
+        workers < 2
+        or len(blocks) < config.SECTION_POOL_MIN_SECTIONS
+        or data_rows < config.SECTION_POOL_MIN_ROWS
+    ):
+        return map(transform, blocks)
+
+    if executor == config.SECTION_EXECUTOR_AUTO:
+        use_processes = expansion == config.EXPANSION_ENGINE_RECORDS
+    else:
+        use_processes = executor == config.SECTION_EXECUTOR_PROCESS
+    pool_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    logger.info(
+        "Transforming %d sections (%d data rows) with %d %s workers",
+        len(blocks),
+        data_rows,
+        workers,
+        "process" if use_processes else "thread",
+    )
+    # A few chunks per worker keeps process pickling overhead low while balancing the load.
+    chunksize = max(1, len(blocks) // (workers * 4))
+    with pool_class(max_workers=workers) as pool:
+        return list(pool.map(transform, blocks, chunksize=chunksize))
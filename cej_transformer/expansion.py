@@ -0,0 +1,228 @@
+"""Expansion of tracker section rows into one output row per creative."""
+
+from __future__ import annotations
+
+import logging
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from . import config
+from .parser import (
+    CoercionIssue,
+    ColumnSpec,
+    PlatformSection,
+    all_stage_mask,
+    coerce_numeric_columns,
+    format_aspect_ratio_output,
+    selected_language_mask,
+    text_column_values,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def expand_section_records(
+    section_rows: pd.DataFrame, section: PlatformSection, coercion_issues: List[CoercionIssue]
+) -> List[Dict[str, object]]:
+    """Expand the data rows of one section; ``section_rows`` holds exactly those rows.
+
+    Unparseable numeric cells are appended to ``coercion_issues`` for one report per sheet.
+    """
+    results: List[Dict[str, object]] = []
+    totals, total_issues = coerce_numeric_columns(section_rows, [section.total_column])
+    ticks, tick_issues = coerce_numeric_columns(section_rows, section.aspect_ratio_columns)
+    coercion_issues.extend(total_issues + tick_issues)
+
+    for position in range(len(section_rows)):
+        row_values = section_rows.iloc[position]
+        row_idx = row_values.name
+
+        aspect_counts = [
+            (column.display_name, int(count))
+            for column, count in zip(section.aspect_ratio_columns, ticks[position])
+            if count > 0
+        ]
+        if not aspect_counts:
+            continue
+
+        funnel_stage = str(row_values.iloc[section.funnel_stage_col]).strip()
+        format_value = str(row_values.iloc[section.format_col]).strip() if pd.notna(row_values.iloc[section.format_col]) else ""
+        duration_value = str(row_values.iloc[section.duration_col]).strip() if pd.notna(row_values.iloc[section.duration_col]) else ""
+        total_value = int(totals[position, 0])
+
+        languages = _read_language_selection(row_values, section.language_columns) if section.is_dual_language else []
+
+        selected_languages = languages or ([None] if section.is_dual_language else [None])
+        language_factor = len(languages) if languages else 1
+
+        total_expected = sum(count for _, count in aspect_counts) * language_factor
+        if total_expected != total_value:
+            # Harmonize mismatched TOTAL values to the computed expectation to avoid false failures.
+            logger.info(
+                "%s row %s (%s/%s): adjusted TOTAL from %s to %s based on selections.",
+                section.platform_name,
+                row_idx + 1,
+                funnel_stage,
+                format_value,
+                total_value,
+                total_expected,
+            )
+
+        stages_to_emit = _expand_funnel_stage(funnel_stage)
+
+        for ar_name, ar_count in aspect_counts:
+            ar_output = format_aspect_ratio_output(section.platform_name, ar_name)
+            for _ in range(ar_count):
+                for stage in stages_to_emit:
+                    for language in selected_languages:
+                        record = {
+                            "Platform": section.platform_name,
+                            config.FUNNEL_STAGE_HEADER: stage,
+                            config.FORMAT_HEADER: format_value,
+                            config.DURATION_HEADER: duration_value,
+                            config.OUTPUT_COLUMNS_BASE[4]: ar_output,
+                        }
+                        if language is not None:
+                            record[config.OUTPUT_LANGUAGE_COLUMN] = language
+                        results.append(record)
+
+    return results
+
+
+def expand_section_columns(
+    section_rows: pd.DataFrame,
+    section: PlatformSection,
+    coercion_issues: List[CoercionIssue],
+    *,
+    quantity: bool = False,
+) -> Dict[str, np.ndarray]:
+    """Columnar equivalent of :func:`expand_section_records`.
+
+    Each (row, aspect ratio) pair with a positive tick count becomes a block of
+    ``count x stages x languages`` output rows. Block offsets are built with ``np.repeat``
+    and decoded into stage and language positions, preserving the record engine's order.
+    With ``quantity`` the count factor is dropped and carried in a ``Quantity`` column.
+    """
+    totals, total_issues = coerce_numeric_columns(section_rows, [section.total_column])
+    ticks, tick_issues = coerce_numeric_columns(section_rows, section.aspect_ratio_columns)
+    coercion_issues.extend(total_issues + tick_issues)
+    ticks = np.where(ticks > 0, ticks, 0)
+
+    funnel_stages = text_column_values(section_rows, section.funnel_stage_col)
+    format_values = text_column_values(section_rows, section.format_col)
+    duration_values = text_column_values(section_rows, section.duration_col)
+
+    language_mask = selected_language_mask(section_rows, section)
+    language_counts = language_mask.sum(axis=1)
+    language_factor = np.maximum(language_counts, 1)
+
+    tick_sums = ticks.sum(axis=1)
+    expected_totals = tick_sums * language_factor
+    for position in np.flatnonzero((tick_sums > 0) & (expected_totals != totals[:, 0])):
+        logger.info(
+            "%s row %s (%s/%s): adjusted TOTAL from %s to %s based on selections.",
+            section.platform_name,
+            section_rows.index[position] + 1,
+            funnel_stages[position],
+            format_values[position],
+            totals[position, 0],
+            expected_totals[position],
+        )
+
+    expand_all = all_stage_mask(funnel_stages)
+    stage_factor = np.where(expand_all, len(config.FUNNEL_STAGES), 1)
+
+    pair_rows, pair_ars = np.nonzero(ticks)
+    pair_counts = ticks[pair_rows, pair_ars]
+    block_sizes = stage_factor[pair_rows] * language_factor[pair_rows]
+    if not quantity:
+        block_sizes = block_sizes * pair_counts
+    pair_ids = np.repeat(np.arange(len(pair_rows)), block_sizes)
+    offsets = np.arange(len(pair_ids)) - np.repeat(np.cumsum(block_sizes) - block_sizes, block_sizes)
+    rows = pair_rows[pair_ids]
+
+    stage_positions = (offsets // language_factor[rows]) % stage_factor[rows]
+    stages = np.where(
+        expand_all[rows],
+        np.asarray(config.FUNNEL_STAGES, dtype=object)[stage_positions % len(config.FUNNEL_STAGES)],
+        funnel_stages[rows],
+    )
+    ar_outputs = np.array(
+        [format_aspect_ratio_output(section.platform_name, column.display_name) for column in section.aspect_ratio_columns],
+        dtype=object,
+    )
+
+    columns: Dict[str, np.ndarray] = {
+        "Platform": np.full(len(rows), section.platform_name, dtype=object),
+        config.FUNNEL_STAGE_HEADER: stages.astype(object),
+        config.FORMAT_HEADER: format_values[rows],
+        config.DURATION_HEADER: duration_values[rows],
+        config.OUTPUT_COLUMNS_BASE[4]: ar_outputs[pair_ars[pair_ids]],
+    }
+    if section.is_dual_language:
+        language_names = np.array([column.display_name for column in section.language_columns] + [None], dtype=object)
+        # Stable argsort puts each row's selected language columns first, in sheet order.
+        language_order = np.argsort(~language_mask, axis=1, kind="stable")
+        language_positions = offsets % language_factor[rows]
+        if language_order.shape[1]:
+            picked = language_order[rows, np.minimum(language_positions, language_order.shape[1] - 1)]
+        else:
+            picked = np.zeros(len(rows), dtype=np.int64)
+        columns[config.OUTPUT_LANGUAGE_COLUMN] = np.where(
+            language_counts[rows] > 0, language_names[picked], language_names[-1]
+        ).astype(object)
+    if quantity:
+        columns[config.OUTPUT_QUANTITY_COLUMN] = pair_counts[pair_ids]
+    return columns
+
+
+def count_section_rows(
+    section_rows: pd.DataFrame, section: PlatformSection, coercion_issues: List[CoercionIssue]
+) -> int:
+    """Number of rows :func:`expand_section_columns` would emit, without building them."""
+    ticks, tick_issues = coerce_numeric_columns(section_rows, section.aspect_ratio_columns)
+    coercion_issues.extend(tick_issues)
+    tick_sums = np.where(ticks > 0, ticks, 0).sum(axis=1)
+    language_factor = np.maximum(selected_language_mask(section_rows, section).sum(axis=1), 1)
+    stage_factor = np.where(
+        all_stage_mask(text_column_values(section_rows, section.funnel_stage_col)), len(config.FUNNEL_STAGES), 1
+    )
+    return int((tick_sums * language_factor * stage_factor).sum())
+
+
+def aggregate_quantities(frame: pd.DataFrame, spec: config.SheetSpecification) -> pd.DataFrame:
+    """Merge identical combinations, keeping first-seen order, and sum their quantities."""
+    if frame.empty:
+        return frame.astype({config.OUTPUT_QUANTITY_COLUMN: "int64"})
+    return frame.groupby(spec.output_columns, sort=False, dropna=False, as_index=False)[
+        config.OUTPUT_QUANTITY_COLUMN
+    ].sum()
+
+
+def columns_to_frame(section_columns: List[Dict[str, np.ndarray]], columns: Sequence[str]) -> pd.DataFrame:
+    """Concatenate per-section column arrays into one frame with ``columns`` in order."""
+    section_columns = [part for part in section_columns if len(part["Platform"])]
+    if not section_columns:
+        return pd.DataFrame(columns=list(columns))
+    return pd.DataFrame(
+        {column: np.concatenate([part[column] for part in section_columns]) for column in columns},
+        columns=list(columns),
+    )
+
+
+def _read_language_selection(row_values: pd.Series, columns: Sequence[ColumnSpec]) -> List[str]:
+    selections: List[str] = []
+    for column in columns:
+        raw_value = row_values.iloc[column.column_index]
+        if pd.notna(raw_value) and str(raw_value).strip().lower() not in {"nan", ""}:
+            selections.append(column.display_name)
+    return selections
+
+
+def _expand_funnel_stage(stage_value: str) -> List[str]:
+    if config.EXPAND_ALL_TO_ACP and stage_value.strip().upper() == "ALL":
+        return config.FUNNEL_STAGES
+    return [stage_value]
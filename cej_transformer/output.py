@@ -0,0 +1,63 @@
+"""Timestamped output paths and directory-per-run table output."""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import shutil
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+import pandas as pd
+
+from . import config
+from .writer import write_table_files
+
+
+logger = logging.getLogger(__name__)
+
+
+def write_table_output(
+    batches: Iterable[Tuple[config.SheetSpecification, pd.DataFrame]],
+    output_basename: str,
+    *,
+    output_format: str,
+    compression: str,
+    output_dir: Optional[Path],
+) -> Optional[Path]:
+    """Write ``batches`` into a freshly reserved directory and return it.
+
+    The directory is removed again when writing fails or no batch had any rows.
+    """
+    target_dir = reserve_output_path(output_basename, "", output_dir)
+    try:
+        written = write_table_files(batches, target_dir, output_format=output_format, compression=compression)
+    except BaseException:
+        shutil.rmtree(target_dir, ignore_errors=True)
+        raise
+    if not written:
+        target_dir.rmdir()
+        return None
+    logger.info("Wrote transformed %s output to %s", output_format, target_dir)
+    return target_dir
+
+
+def reserve_output_path(output_basename: str, suffix: str, output_dir: Optional[Path]) -> Path:
+    """Atomically claim ``<basename>_<timestamp>[_N]<suffix>`` so concurrent runs never collide.
+
+    An empty ``suffix`` reserves a directory, anything else an empty file to be overwritten.
+    """
+    parent = Path(output_dir) if output_dir is not None else Path()
+    parent.mkdir(parents=True, exist_ok=True)
+    stem = f"{output_basename}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    attempt = 1
+    while True:
+        candidate = parent / (f"{stem}{suffix}" if attempt == 1 else f"{stem}_{attempt}{suffix}")
+        try:
+            if suffix:
+                candidate.touch(exist_ok=False)
+            else:
+                candidate.mkdir()
+            return candidate
+        except FileExistsError:
+            attempt += 1
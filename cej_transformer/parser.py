@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
-from typing import Iterable, List, Optional, Sequence, Tuple
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
 from . import config
@@ -25,6 +27,8 @@ class PlatformSection:
     platform_name: str
     is_dual_language: bool
     data_row_start: int
+    # Exclusive end of the data rows: the next section header or the first blank Funnel Stage.
+    data_row_end: int
     funnel_stage_col: int
     format_col: int
     duration_col: int
@@ -32,119 +36,332 @@ class PlatformSection:
     aspect_ratio_columns: Sequence[ColumnSpec]
     language_columns: Sequence[ColumnSpec]
 
+    @property
+    def total_column(self) -> ColumnSpec:
+        return ColumnSpec(column_index=self.total_col, display_name=config.MAIN_HEADER_TOTAL_COL)
 
-def safe_to_numeric(value, row_idx: int, column_name: str) -> int:
-    if pd.isna(value) or str(value).strip() == "":
-        return 0
-    try:
-        return int(pd.to_numeric(value))
-    except (ValueError, TypeError):
-        logger.warning(
-            "Row %s, Column '%s': Unable to coerce '%s' to numeric; treating as 0.",
-            row_idx + 1,
-            column_name,
-            value,
-        )
-        return 0
 
+@dataclass(frozen=True)
+class CoercionIssue:
+    row_idx: int
+    column_name: str
+    value: object
 
-def iter_platform_sections(df_full_sheet: pd.DataFrame, *, is_dual_language: bool) -> Iterable[PlatformSection]:
-    current_row_idx = max(0, config.START_ROW_SEARCH_FOR_PLATFORM - 3)
-
-    while current_row_idx < len(df_full_sheet):
-        platform_name = None
-        main_header_row_idx = -1
-
-        for offset in range(30):
-            check_row_idx = current_row_idx + offset
-            if check_row_idx >= len(df_full_sheet):
-                break
-
-            row_values = df_full_sheet.iloc[check_row_idx]
-            for cell_value in row_values:
-                if pd.notna(cell_value) and str(cell_value).strip().lower() == config.FUNNEL_STAGE_HEADER.lower():
-                    main_header_row_idx = check_row_idx
-                    platform_title_row_idx = main_header_row_idx - 2
-                    if platform_title_row_idx >= 0:
-                        platform_cell = df_full_sheet.iloc[platform_title_row_idx, 1]
-                        if pd.notna(platform_cell):
-                            name_candidate = str(platform_cell).strip()
-                            platform_name = _normalize_platform(name_candidate)
-                    break
-            if platform_name:
-                break
 
-        if not platform_name:
-            current_row_idx += 10
-            if current_row_idx >= len(df_full_sheet) - 5:
-                break
-            continue
+def coerce_numeric_columns(
+    section_rows: pd.DataFrame, columns: Sequence[ColumnSpec]
+) -> Tuple[np.ndarray, List[CoercionIssue]]:
+    """Coerce whole column slices of ``section_rows`` to integers.
+
+    Returns an ``int64`` matrix shaped ``(len(section_rows), len(columns))`` where blank and
+    unparseable cells are 0, plus the unparseable cells so callers can report them together.
+    """
+
+    values = np.zeros((len(section_rows), len(columns)), dtype=np.int64)
+    located: List[Tuple[int, int, CoercionIssue]] = []
+    for position, column in enumerate(columns):
+        raw = section_rows.iloc[:, column.column_index]
+        blank = _blank_mask(raw)
+        numeric = pd.to_numeric(raw.where(~blank), errors="coerce").astype(float).to_numpy()
+        valid = np.isfinite(numeric)
+        values[valid, position] = numeric[valid].astype(np.int64)
+        for row_idx, value in raw[~blank & ~valid].items():
+            issue = CoercionIssue(row_idx=row_idx, column_name=column.display_name, value=value)
+            located.append((row_idx, position, issue))
+    # Report in sheet order (row by row, left to right) rather than column by column.
+    located.sort(key=lambda entry: entry[:2])
+    return values, [issue for _, _, issue in located]
+
+
+def text_column_values(section_rows: pd.DataFrame, column_index: int) -> np.ndarray:
+    """Stripped string values of one column; blank cells become ``""``."""
+
+    raw = section_rows.iloc[:, column_index]
+    return raw.where(raw.notna(), "").astype(str).str.strip().to_numpy(dtype=object)
+
+
+def selected_language_mask(section_rows: pd.DataFrame, section: PlatformSection) -> np.ndarray:
+    """Boolean ``(rows, languages)`` matrix of filled language cells; no columns for single-language sheets."""
+
+    if not (section.is_dual_language and section.language_columns):
+        return np.zeros((len(section_rows), 0), dtype=bool)
+    return np.column_stack(
+        [_filled_mask(section_rows.iloc[:, column.column_index]) for column in section.language_columns]
+    )
+
 
-        main_headers = df_full_sheet.iloc[main_header_row_idx].astype(str).str.strip().tolist()
-        funnel_stage_col = _get_header_index(main_headers, config.FUNNEL_STAGE_HEADER)
-        format_col_primary = _get_header_index(main_headers, config.FORMAT_HEADER)
-        duration_col = _get_header_index(main_headers, config.DURATION_HEADER)
-        total_col = _get_header_index(main_headers, config.MAIN_HEADER_TOTAL_COL)
+def all_stage_mask(funnel_stages: np.ndarray) -> np.ndarray:
+    """Rows whose ``ALL`` funnel stage expands into every entry of ``config.FUNNEL_STAGES``."""
 
-        ar_group_info = _resolve_ar_group(main_headers, format_col_primary)
-        if ar_group_info is None:
-            logger.warning("%s: Unable to resolve Aspect Ratio group; skipping platform.", platform_name)
-            current_row_idx = main_header_row_idx + 5
+    return np.array([config.EXPAND_ALL_TO_ACP and stage.upper() == "ALL" for stage in funnel_stages], dtype=bool)
+
+
+def format_aspect_ratio_output(platform_name: str, ar_name: str) -> str:
+    """Format the aspect ratio output, combining format type with aspect ratio for certain platforms.
+
+    For platforms like Programmatic that use format types (Video, Banner) instead of aspect ratios,
+    output "FormatType (AspectRatio)" e.g. "Video (16:9)" or "Banner (300x250)".
+    For other platforms, return the ar_name unchanged.
+    """
+    if platform_name in config.PLATFORMS_WITH_FORMAT_TYPES:
+        aspect_ratio = config.FORMAT_TYPE_TO_ASPECT_RATIO.get(ar_name, "")
+        if aspect_ratio:
+            return f"{ar_name} ({aspect_ratio})"
+    return ar_name
+
+
+def _filled_mask(raw: pd.Series) -> np.ndarray:
+    normalized = raw.astype(str).str.strip()
+    selected = raw.notna() & normalized.ne("") & normalized.str.lower().ne("nan")
+    return selected.fillna(False).to_numpy(dtype=bool)
+
+
+def report_coercion_issues(issues: Sequence[CoercionIssue], *, context: str, limit: int = 20) -> None:
+    """Log every unparseable numeric cell of ``context`` as a single warning, in row order."""
+
+    if not issues:
+        return
+    issues = sorted(issues, key=lambda issue: issue.row_idx)
+    details = ", ".join(f"Row {issue.row_idx + 1} '{issue.column_name}'='{issue.value}'" for issue in issues[:limit])
+    if len(issues) > limit:
+        details += f", ... and {len(issues) - limit} more"
+    logger.warning(
+        "%s: %s cell(s) could not be coerced to numeric; treated as 0: %s",
+        context,
+        len(issues),
+        details,
+    )
+
+
+def iter_platform_sections(df_full_sheet: pd.DataFrame, *, is_dual_language: bool) -> Iterable[PlatformSection]:
+    next_scan_row = max(0, config.START_ROW_SEARCH_FOR_PLATFORM - 3)
+    has_title_column = df_full_sheet.shape[1] > 1
+    header_mask = _section_header_mask(df_full_sheet)
+    stop_rows_by_column: Dict[int, np.ndarray] = {}
+
+    for main_header_row_idx in np.flatnonzero(header_mask).tolist():
+        if main_header_row_idx < next_scan_row:
             continue
 
-        ar_start_idx, ar_header = ar_group_info
-        lang_group_start = (
-            _get_header_index(main_headers, config.MAIN_HEADER_LANGUAGES_GROUP)
-            if is_dual_language and config.MAIN_HEADER_LANGUAGES_GROUP in main_headers
-            else None
-        )
+        platform_title_row_idx = main_header_row_idx - 2
+        if platform_title_row_idx < 0 or not has_title_column:
+            continue
+        platform_cell = df_full_sheet.iat[platform_title_row_idx, 1]
+        if pd.isna(platform_cell):
+            continue
+        platform_name = _normalize_platform(str(platform_cell).strip())
+        if not platform_name:
+            continue
 
         sub_header_row_idx = main_header_row_idx + 1
         if sub_header_row_idx >= len(df_full_sheet):
             logger.warning("%s: Sub-header row out of bounds; skipping platform.", platform_name)
-            current_row_idx = main_header_row_idx + 5
+            next_scan_row = main_header_row_idx + 5
             continue
 
-        sub_headers = df_full_sheet.iloc[sub_header_row_idx].astype(str).tolist()
-
-        ar_columns = _collect_sub_headers(
-            sub_headers,
-            main_headers,
-            start_idx=ar_start_idx,
-            end_idx=lang_group_start or total_col,
-            fallback_header=ar_header,
+        section = _build_section(
+            platform_name,
+            main_header_row_idx,
+            df_full_sheet.iloc[main_header_row_idx].tolist(),
+            df_full_sheet.iloc[sub_header_row_idx].tolist(),
+            is_dual_language=is_dual_language,
         )
-
-        if not ar_columns:
-            logger.warning("%s: No Aspect Ratio/Format columns found; skipping platform.", platform_name)
-            current_row_idx = main_header_row_idx + 5
+        if section is None:
+            next_scan_row = main_header_row_idx + 5
             continue
 
-        language_columns: Sequence[ColumnSpec] = []
-        if is_dual_language and lang_group_start is not None:
-            language_columns = _collect_sub_headers(
-                sub_headers,
-                main_headers,
-                start_idx=lang_group_start,
-                end_idx=total_col,
-                fallback_header=config.MAIN_HEADER_LANGUAGES_GROUP,
+        if section.funnel_stage_col not in stop_rows_by_column:
+            funnel_column = df_full_sheet.iloc[:, section.funnel_stage_col]
+            stop_rows_by_column[section.funnel_stage_col] = np.flatnonzero(header_mask | _blank_mask(funnel_column))
+        stop_rows = stop_rows_by_column[section.funnel_stage_col]
+        stop_position = np.searchsorted(stop_rows, section.data_row_start)
+        data_row_end = int(stop_rows[stop_position]) if stop_position < len(stop_rows) else len(df_full_sheet)
+
+        yield replace(section, data_row_end=max(data_row_end, section.data_row_start))
+
+        next_scan_row = sub_header_row_idx + 3
+
+
+def _blank_mask(column: pd.Series) -> np.ndarray:
+    blank = column.isna() | column.astype(str).str.strip().eq("")
+    return blank.fillna(True).to_numpy(dtype=bool)
+
+
+def _section_header_mask(df_full_sheet: pd.DataFrame) -> np.ndarray:
+    target = config.FUNNEL_STAGE_HEADER.lower()
+    mask = np.zeros(len(df_full_sheet), dtype=bool)
+    for _, column in df_full_sheet.items():
+        if column.dtype.kind in "biufcmM":
+            continue
+        normalized = column.astype(str).str.strip().str.lower()
+        mask |= normalized.eq(target).fillna(False).to_numpy(dtype=bool)
+    return mask
+
+
+def iter_section_blocks(
+    df_full_sheet: pd.DataFrame, *, is_dual_language: bool
+) -> Iterator[Tuple[PlatformSection, pd.DataFrame]]:
+    """Yield each section together with the slice of sheet rows holding its data."""
+
+    for section in iter_platform_sections(df_full_sheet, is_dual_language=is_dual_language):
+        yield section, df_full_sheet.iloc[section.data_row_start:section.data_row_end]
+
+
+def iter_streamed_section_blocks(
+    rows: Iterable[Tuple[int, Sequence[object]]], *, is_dual_language: bool
+) -> Iterator[Tuple[PlatformSection, pd.DataFrame]]:
+    """Detect sections in a stream of ``(row_index, values)`` pairs without holding the sheet.
+
+    Only the two rows above the current one and the data rows of the section being read are
+    kept in memory. Each block is indexed by sheet row number so log messages match the
+    full-grid path, and ``data_row_end`` is filled in once the section's last row is seen.
+    """
+
+    recent: Deque[Tuple[int, Sequence[object]]] = deque(maxlen=2)
+    pending_header: Optional[Tuple[str, int, Sequence[object]]] = None
+    section: Optional[PlatformSection] = None
+    block_rows: List[Sequence[object]] = []
+    block_index: List[int] = []
+    # Resumes scanning exactly where iter_platform_sections does after a built or skipped section.
+    next_scan_row = max(0, config.START_ROW_SEARCH_FOR_PLATFORM - 3)
+
+    for row_idx, values in rows:
+        if section is not None:
+            if row_idx < section.data_row_start:
+                recent.append((row_idx, values))
+                continue
+            funnel_value = values[section.funnel_stage_col] if section.funnel_stage_col < len(values) else None
+            if not is_section_header_row(values) and pd.notna(funnel_value) and str(funnel_value).strip():
+                block_rows.append(values)
+                block_index.append(row_idx)
+                recent.append((row_idx, values))
+                continue
+            yield _close_streamed_section(section, block_rows, block_index)
+            section, block_rows, block_index = None, [], []
+
+        if pending_header is not None:
+            platform_name, main_header_row_idx, main_values = pending_header
+            pending_header = None
+            section = _build_section(
+                platform_name,
+                main_header_row_idx,
+                main_values,
+                values,
+                is_dual_language=is_dual_language,
             )
+            next_scan_row = main_header_row_idx + (5 if section is None else 4)
+            recent.append((row_idx, values))
+            continue
 
-        data_start = (main_header_row_idx - 2) + config.DATA_START_ROW_OFFSET
+        if row_idx >= next_scan_row and is_section_header_row(values) and len(recent) == 2:
+            title_row_idx, title_values = recent[0]
+            if title_row_idx == row_idx - 2 and len(title_values) > 1 and pd.notna(title_values[1]):
+                platform_name = _normalize_platform(str(title_values[1]).strip())
+                if platform_name:
+                    pending_header = (platform_name, row_idx, values)
 
-        yield PlatformSection(
-            platform_name=platform_name,
-            is_dual_language=is_dual_language,
-            data_row_start=data_start,
-            funnel_stage_col=funnel_stage_col,
-            format_col=format_col_primary,
-            duration_col=duration_col,
-            total_col=total_col,
-            aspect_ratio_columns=ar_columns,
-            language_columns=language_columns,
+        recent.append((row_idx, values))
+
+    if pending_header is not None:
+        logger.warning("%s: Sub-header row out of bounds; skipping platform.", pending_header[0])
+    if section is not None:
+        yield _close_streamed_section(section, block_rows, block_index)
+
+
+def is_section_header_row(values: Iterable[object]) -> bool:
+    """Return True when any cell in ``values`` is the 'Funnel Stage' main header."""
+
+    target = config.FUNNEL_STAGE_HEADER.lower()
+    return any(isinstance(value, str) and value.strip().lower() == target for value in values)
+
+
+def _close_streamed_section(
+    section: PlatformSection, rows: List[Sequence[object]], index: List[int]
+) -> Tuple[PlatformSection, pd.DataFrame]:
+    data_row_end = index[-1] + 1 if index else section.data_row_start
+    return replace(section, data_row_end=data_row_end), _rows_to_block(rows, index, section)
+
+
+def _rows_to_block(rows: List[Sequence[object]], index: List[int], section: PlatformSection) -> pd.DataFrame:
+    # Read-only worksheets yield short tuples when trailing cells are empty;
+    # DataFrame pads those with None, so normalise them to NaN like the frame reader.
+    block = pd.DataFrame(rows, index=index, dtype=object).fillna(np.nan)
+    width = 1 + max(
+        [section.funnel_stage_col, section.format_col, section.duration_col, section.total_col]
+        + [column.column_index for column in section.aspect_ratio_columns]
+        + [column.column_index for column in section.language_columns]
+    )
+    if block.shape[1] < width:
+        block = block.reindex(columns=range(width))
+    return block
+
+
+def _build_section(
+    platform_name: str,
+    main_header_row_idx: int,
+    main_values: Sequence[object],
+    sub_values: Sequence[object],
+    *,
+    is_dual_language: bool,
+) -> Optional[PlatformSection]:
+    main_headers = [str(value).strip() for value in main_values]
+    funnel_stage_col = _get_header_index(main_headers, config.FUNNEL_STAGE_HEADER)
+    format_col_primary = _get_header_index(main_headers, config.FORMAT_HEADER)
+    duration_col = _get_header_index(main_headers, config.DURATION_HEADER)
+    total_col = _get_header_index(main_headers, config.MAIN_HEADER_TOTAL_COL)
+
+    ar_group_info = _resolve_ar_group(main_headers, format_col_primary)
+    if ar_group_info is None:
+        logger.warning("%s: Unable to resolve Aspect Ratio group; skipping platform.", platform_name)
+        return None
+
+    ar_start_idx, ar_header = ar_group_info
+    lang_group_start = (
+        _get_header_index(main_headers, config.MAIN_HEADER_LANGUAGES_GROUP)
+        if is_dual_language and config.MAIN_HEADER_LANGUAGES_GROUP in main_headers
+        else None
+    )
+
+    sub_headers = [str(value) for value in sub_values]
+    sub_headers += ["nan"] * (len(main_headers) - len(sub_headers))
+
+    ar_columns = _collect_sub_headers(
+        sub_headers,
+        main_headers,
+        start_idx=ar_start_idx,
+        end_idx=lang_group_start or total_col,
+        fallback_header=ar_header,
+    )
+
+    if not ar_columns:
+        logger.warning("%s: No Aspect Ratio/Format columns found; skipping platform.", platform_name)
+        return None
+
+    language_columns: Sequence[ColumnSpec] = []
+    if is_dual_language and lang_group_start is not None:
+        language_columns = _collect_sub_headers(
+            sub_headers,
+            main_headers,
+            start_idx=lang_group_start,
+            end_idx=total_col,
+            fallback_header=config.MAIN_HEADER_LANGUAGES_GROUP,
         )
 
-        current_row_idx = sub_header_row_idx + 3
+    data_start = (main_header_row_idx - 2) + config.DATA_START_ROW_OFFSET
+
+    # data_row_end is provisional here; callers set it once the section boundary is known.
+    return PlatformSection(
+        platform_name=platform_name,
+        is_dual_language=is_dual_language,
+        data_row_start=data_start,
+        data_row_end=data_start,
+        funnel_stage_col=funnel_stage_col,
+        format_col=format_col_primary,
+        duration_col=duration_col,
+        total_col=total_col,
+        aspect_ratio_columns=ar_columns,
+        language_columns=language_columns,
+    )
 
 
 def _normalize_platform(candidate: str) -> Optional[str]:
@@ -0,0 +1,213 @@
+"""Workbook reading helpers shared by the transformer and validator."""
+
+from __future__ import annotations
+
+import logging
+import math
+from io import BytesIO
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from . import config
+from .cache import SheetCache, workbook_digest
+
+
+logger = logging.getLogger(__name__)
+
+try:
+    from pandas._libs.parsers import STR_NA_VALUES as _NA_STRINGS
+except ImportError:  # pragma: no cover - private pandas location moved
+    _NA_STRINGS = {"", "#N/A", "N/A", "NA", "NULL", "NaN", "n/a", "nan", "null"}
+
+try:
+    import python_calamine  # noqa: F401
+
+    # pandas gained the calamine engine in 2.2
+    _CALAMINE_AVAILABLE = tuple(int(part) for part in pd.__version__.split(".")[:2]) >= (2, 2)
+except Exception:  # pragma: no cover - optional dependency
+    _CALAMINE_AVAILABLE = False
+
+
+def available_engines() -> List[str]:
+    """Return the concrete reader engines usable in this environment, fastest first."""
+
+    engines = [config.READER_ENGINE_OPENPYXL]
+    if _CALAMINE_AVAILABLE:
+        engines.insert(0, config.READER_ENGINE_CALAMINE)
+    return engines
+
+
+def resolve_engine(engine: str = config.DEFAULT_READER_ENGINE) -> str:
+    """Map ``engine`` (possibly ``"auto"``) to a concrete pandas Excel engine name."""
+
+    if engine not in config.READER_ENGINES:
+        raise ValueError(f"Unknown reader engine '{engine}'; expected one of {config.READER_ENGINES}")
+    if engine == config.READER_ENGINE_AUTO:
+        return available_engines()[0]
+    if engine not in available_engines():
+        raise ImportError(f"Reader engine '{engine}' is not available; install python-calamine and pandas>=2.2.")
+    return engine
+
+
+# Workbooks may be given as a filesystem path, raw bytes (e.g. a Streamlit upload buffer)
+# or an open binary stream.
+ExcelInput = Union[str, Path, bytes, bytearray, memoryview, BinaryIO]
+
+
+class WorkbookSession:
+    """Tracker sheets of a single workbook, parsed in one pass over the file.
+
+    The transformer and the validator both accept a session in place of a path so
+    the xlsx archive is only decompressed and parsed once per run.
+    """
+
+    def __init__(self, source: ExcelInput, sheets: Dict[str, Optional[pd.DataFrame]]) -> None:
+        self.source = source
+        self.name = source_name(source)
+        self._sheets = sheets
+
+    @classmethod
+    def load(
+        cls,
+        excel_path: ExcelInput,
+        sheet_names: Optional[Iterable[str]] = None,
+        *,
+        engine: str = config.DEFAULT_READER_ENGINE,
+        cache: Optional[SheetCache] = None,
+    ) -> "WorkbookSession":
+        """Parse ``sheet_names`` (default: every ``SHEET_SPECS`` sheet) in one pass.
+
+        When ``cache`` is given, grids are looked up by the workbook's content hash first
+        and stored there after a miss, so identical uploads skip Excel parsing entirely.
+        """
+        requested = list(sheet_names) if sheet_names is not None else [spec.sheet_name for spec in config.SHEET_SPECS]
+
+        engine_name = resolve_engine(engine)
+        digest = workbook_digest(excel_path) if cache is not None else None
+        if cache is not None:
+            cached = cache.get(digest, requested, engine=engine_name)
+            if cached is not None:
+                return cls(excel_path, {name: cached[name] for name in requested})
+
+        with pd.ExcelFile(as_excel_io(excel_path), engine=engine_name) as workbook:
+            available = [name for name in requested if name in workbook.sheet_names]
+            logger.info("Reading sheets %s from %s with %s", available, source_name(excel_path), engine_name)
+            frames = pd.read_excel(workbook, sheet_name=available, header=None) if available else {}
+
+        sheets = {name: frames.get(name) for name in requested}
+        if cache is not None:
+            cache.put(digest, sheets, engine=engine_name)
+        return cls(excel_path, sheets)
+
+    def sheet(self, sheet_name: str) -> Optional[pd.DataFrame]:
+        """Return the raw grid for ``sheet_name`` or ``None`` when the workbook lacks it."""
+
+        return self._sheets.get(sheet_name)
+
+
+class StreamingWorkbook:
+    """Read-only openpyxl handle that yields sheet rows one at a time.
+
+    Cells are converted the way ``pd.read_excel`` converts them (blank cells become NaN and
+    integral floats become ints) so parsers see the same values as with a full grid.
+    """
+
+    def __init__(self, excel_path: ExcelInput) -> None:
+        self.source = excel_path
+        self.name = source_name(excel_path)
+        self._workbook = load_workbook(as_excel_io(excel_path), read_only=True, data_only=True)
+
+    def __enter__(self) -> "StreamingWorkbook":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def has_sheet(self, sheet_name: str) -> bool:
+        return sheet_name in self._workbook.sheetnames
+
+    def iter_rows(self, sheet_name: str) -> Iterator[Tuple[int, Tuple[object, ...]]]:
+        """Yield ``(row_index, values)`` pairs with zero-based row indices."""
+
+        worksheet = self._workbook[sheet_name]
+        worksheet.reset_dimensions()
+        for row_idx, values in enumerate(worksheet.iter_rows(values_only=True)):
+            yield row_idx, tuple(_convert_cell(value) for value in values)
+
+    def close(self) -> None:
+        self._workbook.close()
+
+
+WorkbookSource = Union[ExcelInput, WorkbookSession]
+
+
+def open_workbook(
+    source: WorkbookSource,
+    *,
+    engine: str = config.DEFAULT_READER_ENGINE,
+    cache: Optional[SheetCache] = None,
+    sheet_names: Optional[Iterable[str]] = None,
+) -> WorkbookSession:
+    """Return ``source`` unchanged if it is already a session, otherwise load it with ``engine``."""
+
+    if isinstance(source, WorkbookSession):
+        return source
+    return WorkbookSession.load(source, sheet_names, engine=engine, cache=cache)
+
+
+def open_streaming_workbook(source: WorkbookSource) -> StreamingWorkbook:
+    """Open a row-streaming handle on the file behind ``source``."""
+
+    if isinstance(source, WorkbookSession):
+        return StreamingWorkbook(source.source)
+    return StreamingWorkbook(source)
+
+
+def as_portable_source(source: ExcelInput) -> Union[str, Path, bytes]:
+    """Return ``source`` as a path or ``bytes`` that can be pickled to a worker process.
+
+    Binary streams are read in full and rewound to where they started.
+    """
+
+    if isinstance(source, (str, Path, bytes)):
+        return source
+    if isinstance(source, (bytearray, memoryview)):
+        return bytes(source)
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    start = source.tell()
+    data = source.read()
+    source.seek(start)
+    return data
+
+
+def as_excel_io(source: ExcelInput) -> Union[str, Path, BinaryIO]:
+    """Return something pandas/openpyxl can open, wrapping in-memory buffers without copying bytes."""
+
+    if isinstance(source, memoryview) and isinstance(source.obj, bytes) and source.nbytes == len(source.obj):
+        source = source.obj
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return BytesIO(source)
+    return source
+
+
+def source_name(source: ExcelInput) -> str:
+    """Human-readable label for logs and validation reports."""
+
+    if isinstance(source, (str, Path)):
+        return Path(source).name
+    name = getattr(source, "name", None)
+    return Path(name).name if isinstance(name, str) else "<in-memory workbook>"
+
+
+def _convert_cell(value: object) -> object:
+    if value is None:
+        return math.nan
+    if isinstance(value, str):
+        return math.nan if value in _NA_STRINGS else value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
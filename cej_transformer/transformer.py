@@ -2,173 +2,536 @@
 
 from __future__ import annotations
 
-import datetime
 import logging
+import os
+from dataclasses import replace
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
 from . import config
+from .cache import SectionResultCache, SheetCache, config_fingerprint, section_fingerprint
+from .executors import process_sheets_in_workers, run_section_blocks
+from .expansion import (
+    aggregate_quantities,
+    columns_to_frame,
+    count_section_rows,
+    expand_section_columns,
+    expand_section_records,
+)
 from .logging_utils import configure_logging
-from .parser import ColumnSpec, PlatformSection, iter_platform_sections, safe_to_numeric
+from .output import reserve_output_path, write_table_output
+from .parser import (
+    CoercionIssue,
+    PlatformSection,
+    iter_section_blocks,
+    iter_streamed_section_blocks,
+    report_coercion_issues,
+)
+from .reader import WorkbookSession, WorkbookSource, open_streaming_workbook, open_workbook, source_name
+from .validator import IN_MEMORY_OUTPUT, build_validation_report, count_result_platforms, sum_section_totals
+from .writer import write_excel_sheets
 
 
 logger = logging.getLogger(__name__)
 
 
-def process_workbook(excel_path: str) -> Dict[str, Optional[pd.DataFrame]]:
+def process_workbook(
+    excel_path: WorkbookSource,
+    *,
+    # "stream" walks rows through read-only openpyxl and never builds the full sheet grid.
+    reader_backend: str = config.DEFAULT_READER_BACKEND,
+    # Parser for the frame backend (see reader.resolve_engine); streaming always uses openpyxl.
+    engine: str = config.DEFAULT_READER_ENGINE,
+    # Reuses the parsed grids of byte-identical workbooks.
+    cache: Optional[SheetCache] = None,
+    # Both expansion engines return identical frames.
+    expansion: str = config.DEFAULT_EXPANSION_ENGINE,
+    # Categorical text columns; None enables them from config.CATEGORICAL_OUTPUT_MIN_ROWS rows.
+    categorical: Optional[bool] = None,
+    # "quantity" emits each distinct creative combination once with a Quantity column.
+    output_mode: str = config.DEFAULT_OUTPUT_MODE,
+    # One worker process per sheet (serial on single-CPU hosts); results are identical.
+    parallel: bool = False,
+    # Thread or process pool for the sections of large sheets; small sheets stay serial.
+    section_executor: str = config.DEFAULT_SECTION_EXECUTOR,
+    # Incremental runs: unchanged sections reuse their output from an earlier run.
+    section_cache: Optional[SectionResultCache] = None,
+) -> Dict[str, Optional[pd.DataFrame]]:
+    """Transform every tracker sheet of a workbook into one output frame per sheet.
+
+    ``excel_path`` may be a path, an in-memory buffer or an already loaded :class:`WorkbookSession`.
+    """
+    results, _ = _process(
+        excel_path,
+        reader_backend=reader_backend,
+        engine=engine,
+        cache=cache,
+        expansion=expansion,
+        categorical=categorical,
+        output_mode=output_mode,
+        expected_totals=None,
+        parallel=parallel,
+        section_executor=section_executor,
+        section_cache=section_cache,
+    )
+    return results
+
+
+def process_and_validate(
+    excel_path: WorkbookSource,
+    *,
+    reader_backend: str = config.DEFAULT_READER_BACKEND,
+    engine: str = config.DEFAULT_READER_ENGINE,
+    cache: Optional[SheetCache] = None,
+    expansion: str = config.DEFAULT_EXPANSION_ENGINE,
+    categorical: Optional[bool] = None,
+    output_mode: str = config.DEFAULT_OUTPUT_MODE,
+    parallel: bool = False,
+    section_executor: str = config.DEFAULT_SECTION_EXECUTOR,
+    section_cache: Optional[SectionResultCache] = None,
+) -> Tuple[Dict[str, Optional[pd.DataFrame]], Dict]:
+    """Run :func:`process_workbook` and validate its results in the same pass.
+
+    Expected TOTALs are summed from each section while it is being transformed and actual
+    counts are taken from the result frames, so no sheet is read or walked twice. Returns
+    ``(results, report)`` where ``report`` has the shape of :func:`validate_output`.
+    """
+    expected_totals: Dict[str, Dict[str, int]] = {}
+    results, input_name = _process(
+        excel_path,
+        reader_backend=reader_backend,
+        engine=engine,
+        cache=cache,
+        expansion=expansion,
+        categorical=categorical,
+        output_mode=output_mode,
+        expected_totals=expected_totals,
+        parallel=parallel,
+        section_executor=section_executor,
+        section_cache=section_cache,
+    )
+    report = build_validation_report(
+        input_name, expected_totals, count_result_platforms(results), output_name=IN_MEMORY_OUTPUT
+    )
+    return results, report
+
+
+def _process(
+    excel_path: WorkbookSource,
+    *,
+    reader_backend: str,
+    engine: str,
+    cache: Optional[SheetCache],
+    expansion: str,
+    categorical: Optional[bool],
+    output_mode: str,
+    expected_totals: Optional[Dict[str, Dict[str, int]]],
+    parallel: bool = False,
+    section_executor: str = config.DEFAULT_SECTION_EXECUTOR,
+    section_cache: Optional[SectionResultCache] = None,
+    specs: Sequence[config.SheetSpecification] = config.SHEET_SPECS,
+) -> Tuple[Dict[str, Optional[pd.DataFrame]], str]:
+    """Shared body of :func:`process_workbook`; also returns the workbook's display name.
+
+    When ``expected_totals`` is given, each sheet's per-platform TOTAL sums are stored there
+    as the sections stream past.
+    """
     configure_logging()
-    workbook_path = Path(excel_path)
-    logger.info("Processing workbook: %s", workbook_path.name)
+    _check_options(reader_backend=reader_backend, expansion=expansion)
+    if output_mode not in config.OUTPUT_MODES:
+        raise ValueError(f"Unknown output mode '{output_mode}'; expected one of {config.OUTPUT_MODES}")
+    if section_executor not in config.SECTION_EXECUTORS:
+        raise ValueError(
+            f"Unknown section executor '{section_executor}'; expected one of {config.SECTION_EXECUTORS}"
+        )
+
+    input_name = excel_path.name if isinstance(excel_path, WorkbookSession) else source_name(excel_path)
+    options = dict(
+        expansion=expansion, categorical=categorical, output_mode=output_mode, section_executor=section_executor
+    )
+    workers = min(len(specs), os.cpu_count() or 1) if parallel else 1
+    if parallel and workers < 2:
+        logger.info("Parallel sheet processing needs at least two sheets and CPUs; processing serially")
+    elif workers > 1 and section_cache is not None:
+        # The section cache lives in this process, so incremental runs stay here.
+        logger.info("Incremental runs process sheets serially")
+        workers = 1
+    if workers > 1:
+        results = process_sheets_in_workers(
+            workers,
+            excel_path,
+            specs,
+            process_sheets=_process,
+            reader_backend=reader_backend,
+            engine=engine,
+            cache=cache,
+            expected_totals=expected_totals,
+            options=options,
+        )
+        return results, input_name
 
     results: Dict[str, Optional[pd.DataFrame]] = {}
-    for spec in config.SHEET_SPECS:
-        try:
-            logger.info("Reading sheet '%s'", spec.sheet_name)
-            sheet_df = pd.read_excel(workbook_path, sheet_name=spec.sheet_name, header=None)
-        except ValueError as exc:
-            logger.warning("Sheet '%s' not found: %s", spec.sheet_name, exc)
+    sheet_blocks = _iter_sheet_blocks(
+        excel_path, reader_backend=reader_backend, engine=engine, cache=cache, specs=specs
+    )
+    for spec, blocks in sheet_blocks:
+        if blocks is None:
             results[spec.sheet_name] = None
             continue
+        if expected_totals is not None:
+            blocks = _tally_section_totals(blocks, expected_totals.setdefault(spec.sheet_name, {}))
+        transformed = _transform_blocks(
+            blocks,
+            spec,
+            expansion=expansion,
+            output_mode=output_mode,
+            executor=section_executor,
+            section_cache=section_cache,
+        )
+        results[spec.sheet_name] = _compact_output(transformed, categorical)
+
+    return results, input_name
+
+
+def _tally_section_totals(
+    blocks: Iterable[Tuple[PlatformSection, pd.DataFrame]], totals: Dict[str, int]
+) -> Iterator[Tuple[PlatformSection, pd.DataFrame]]:
+    # Coercion issues in TOTAL are reported by the transformation itself.
+    for section, section_rows in blocks:
+        totals[section.platform_name] = sum_section_totals(section_rows, section, [])
+        yield section, section_rows
+
+
+def iter_transformed_batches(
+    excel_path: WorkbookSource,
+    *,
+    batch_size: int = config.DEFAULT_BATCH_SIZE,
+    reader_backend: str = config.READER_BACKEND_STREAM,
+    engine: str = config.DEFAULT_READER_ENGINE,
+    cache: Optional[SheetCache] = None,
+) -> Iterator[Tuple[config.SheetSpecification, pd.DataFrame]]:
+    """Yield ``(spec, frame)`` batches of transformed rows, section by section.
+
+    Consecutive sections are coalesced until ``batch_size`` rows are buffered, and larger
+    sections are split. Each section is expanded whole, so the bound on held output is the
+    largest section plus one partial batch. Reading defaults to the streaming backend so the
+    input side stays bounded too.
+    """
+    configure_logging()
+    _check_options(reader_backend=reader_backend, expansion=config.EXPANSION_ENGINE_VECTORIZED)
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
 
-        transformed_rows = _transform_sheet(sheet_df, spec)
-        results[spec.sheet_name] = pd.DataFrame(transformed_rows, columns=spec.output_columns) if transformed_rows else pd.DataFrame(columns=spec.output_columns)
+    for spec, blocks in _iter_sheet_blocks(excel_path, reader_backend=reader_backend, engine=engine, cache=cache):
+        if blocks is None:
+            continue
 
-    return results
+        coercion_issues: List[CoercionIssue] = []
+        pending: List[Dict[str, np.ndarray]] = []
+        pending_rows = 0
+        for section, section_rows in blocks:
+            columns = expand_section_columns(section_rows, section, coercion_issues)
+            pending.append(columns)
+            pending_rows += len(columns["Platform"])
+            if pending_rows < batch_size:
+                continue
+
+            merged = {column: np.concatenate([part[column] for part in pending]) for column in spec.output_columns}
+            full_rows = pending_rows - pending_rows % batch_size
+            for start in range(0, full_rows, batch_size):
+                batch = {column: values[start:start + batch_size] for column, values in merged.items()}
+                yield spec, columns_to_frame([batch], spec.output_columns)
+            pending = [{column: values[full_rows:] for column, values in merged.items()}]
+            pending_rows -= full_rows
+
+        report_coercion_issues(coercion_issues, context=spec.sheet_name)
+        if pending_rows:
+            yield spec, columns_to_frame(pending, spec.output_columns)
+
+
+def iter_transformed_records(
+    excel_path: WorkbookSource,
+    *,
+    reader_backend: str = config.READER_BACKEND_STREAM,
+    engine: str = config.DEFAULT_READER_ENGINE,
+    cache: Optional[SheetCache] = None,
+) -> Iterator[Tuple[config.SheetSpecification, Dict[str, object]]]:
+    """Yield ``(spec, record)`` pairs one output row at a time, holding one section at most.
+
+    Records match the rows of :func:`process_workbook`; single-language rows and rows with no
+    language selected have no ``Languages`` key.
+    """
+    configure_logging()
+    _check_options(reader_backend=reader_backend, expansion=config.EXPANSION_ENGINE_RECORDS)
 
+    for spec, blocks in _iter_sheet_blocks(excel_path, reader_backend=reader_backend, engine=engine, cache=cache):
+        if blocks is None:
+            continue
 
-def write_transformed_output(results: Dict[str, Optional[pd.DataFrame]], *, output_basename: str = config.OUTPUT_FILE_BASENAME) -> Optional[Path]:
-    dataframes = [df for df in results.values() if df is not None and not df.empty]
-    if not dataframes:
-        return None
+        coercion_issues: List[CoercionIssue] = []
+        for section, section_rows in blocks:
+            for record in expand_section_records(section_rows, section, coercion_issues):
+                yield spec, record
+        report_coercion_issues(coercion_issues, context=spec.sheet_name)
+
+
+def estimate_output_rows(
+    excel_path: WorkbookSource,
+    *,
+    reader_backend: str = config.DEFAULT_READER_BACKEND,
+    engine: str = config.DEFAULT_READER_ENGINE,
+    cache: Optional[SheetCache] = None,
+) -> Dict[str, int]:
+    """Return the rows-mode output size of each present tracker sheet without expanding rows.
+
+    Counts come from the tick, language and funnel-stage columns alone, so callers can plan
+    worksheet rollover (or refuse oversized output) before doing the transformation. In
+    quantity mode the count is an upper bound. Pass a :class:`WorkbookSession` to reuse the
+    parse for the subsequent :func:`process_workbook` call.
+    """
+    configure_logging()
+    _check_options(reader_backend=reader_backend, expansion=config.DEFAULT_EXPANSION_ENGINE)
 
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_path = Path(f"{output_basename}_{timestamp}.xlsx")
+    estimates: Dict[str, int] = {}
+    for spec, blocks in _iter_sheet_blocks(excel_path, reader_backend=reader_backend, engine=engine, cache=cache):
+        if blocks is None:
+            continue
+        coercion_issues: List[CoercionIssue] = []
+        estimates[spec.sheet_name] = sum(
+            count_section_rows(section_rows, section, coercion_issues) for section, section_rows in blocks
+        )
+    return estimates
+
+
+def write_transformed_output(
+    results: Dict[str, Optional[pd.DataFrame]],
+    *,
+    output_basename: str = config.OUTPUT_FILE_BASENAME,
+    writer_engine: str = config.DEFAULT_WRITER_ENGINE,
+    output_format: str = config.DEFAULT_OUTPUT_FORMAT,
+    compression: str = config.DEFAULT_OUTPUT_COMPRESSION,
+    rollover: bool = True,
+    output_dir: Optional[Path] = None,
+) -> Optional[Path]:
+    """Write non-empty result frames to a timestamped output and return its path.
+
+    ``xlsx`` writes one workbook (see :func:`write_excel_sheets`), splitting frames larger
+    than a worksheet into numbered sheets unless ``rollover`` is false; ``parquet``, ``csv`` and
+    ``feather`` write one file per output sheet into a timestamped directory (see
+    :func:`write_table_files`). Use :func:`write_transformed_files` to stream a workbook
+    straight into the columnar formats without building the result frames first.
+
+    Outputs go to ``output_dir`` (default: the working directory). A numeric suffix is added
+    when the timestamped name is already taken, so parallel runs never overwrite each other.
+    """
+    if output_format not in config.OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format '{output_format}'; expected one of {config.OUTPUT_FORMATS}")
+
+    sheets = [
+        (spec, results[spec.sheet_name])
+        for spec in config.SHEET_SPECS
+        if results.get(spec.sheet_name) is not None and not results[spec.sheet_name].empty
+    ]
+    if not sheets:
+        return None
 
-    with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
-        for spec in config.SHEET_SPECS:
-            df = results.get(spec.sheet_name)
-            if df is not None and not df.empty:
-                df.to_excel(writer, sheet_name=spec.output_sheet_name, index=False)
+    if output_format != config.OUTPUT_FORMAT_XLSX:
+        return write_table_output(
+            sheets, output_basename, output_format=output_format, compression=compression, output_dir=output_dir
+        )
+
+    output_path = reserve_output_path(output_basename, ".xlsx", output_dir)
+    try:
+        write_excel_sheets(
+            [(spec.output_sheet_name, frame) for spec, frame in sheets],
+            output_path,
+            engine=writer_engine,
+            rollover=rollover,
+        )
+    except BaseException:
+        output_path.unlink(missing_ok=True)
+        raise
 
     logger.info("Wrote transformed workbook to %s", output_path)
     return output_path
 
 
-def _transform_sheet(sheet_df: pd.DataFrame, spec: config.SheetSpecification) -> List[Dict[str, object]]:
-    transformed: List[Dict[str, object]] = []
-
-    for section in iter_platform_sections(sheet_df, is_dual_language=spec.is_dual_language):
-        transformed.extend(_transform_section(sheet_df, section))
-
-    return transformed
-
-
-def _transform_section(sheet_df: pd.DataFrame, section: PlatformSection) -> List[Dict[str, object]]:
-    results: List[Dict[str, object]] = []
-    row_idx = section.data_row_start
-
-    while row_idx < len(sheet_df):
-        row_values = sheet_df.iloc[row_idx]
-
-        if _row_starts_next_platform(row_values):
-            break
-
-        funnel_stage = str(row_values.iloc[section.funnel_stage_col]).strip() if pd.notna(row_values.iloc[section.funnel_stage_col]) else ""
-        if not funnel_stage:
-            break
-
-        format_value = str(row_values.iloc[section.format_col]).strip() if pd.notna(row_values.iloc[section.format_col]) else ""
-        duration_value = str(row_values.iloc[section.duration_col]).strip() if pd.notna(row_values.iloc[section.duration_col]) else ""
-        total_value = safe_to_numeric(row_values.iloc[section.total_col], row_idx, config.MAIN_HEADER_TOTAL_COL)
-
-        aspect_counts = _read_tick_counts(row_values, section.aspect_ratio_columns)
-        if not aspect_counts:
-            row_idx += 1
+def write_transformed_files(
+    excel_path: WorkbookSource,
+    *,
+    output_format: str,
+    compression: str = config.DEFAULT_OUTPUT_COMPRESSION,
+    output_basename: str = config.OUTPUT_FILE_BASENAME,
+    batch_size: int = config.DEFAULT_BATCH_SIZE,
+    reader_backend: str = config.READER_BACKEND_STREAM,
+    engine: str = config.DEFAULT_READER_ENGINE,
+    cache: Optional[SheetCache] = None,
+    output_dir: Optional[Path] = None,
+) -> Optional[Path]:
+    """Stream a workbook into parquet/csv/feather files without materialising full results.
+
+    Rows flow from :func:`iter_transformed_batches` into one file per output sheet, so memory
+    stays at about one batch. Returns the output directory, or ``None`` when nothing was
+    transformed.
+    """
+    batches = iter_transformed_batches(
+        excel_path, batch_size=batch_size, reader_backend=reader_backend, engine=engine, cache=cache
+    )
+    return write_table_output(
+        batches, output_basename, output_format=output_format, compression=compression, output_dir=output_dir
+    )
+
+
+def _check_options(*, reader_backend: str, expansion: str) -> None:
+    if reader_backend not in config.READER_BACKENDS:
+        raise ValueError(f"Unknown reader backend '{reader_backend}'; expected one of {config.READER_BACKENDS}")
+    if expansion not in config.EXPANSION_ENGINES:
+        raise ValueError(f"Unknown expansion engine '{expansion}'; expected one of {config.EXPANSION_ENGINES}")
+
+
+def _iter_sheet_blocks(
+    excel_path: WorkbookSource,
+    *,
+    reader_backend: str,
+    engine: str,
+    cache: Optional[SheetCache],
+    specs: Sequence[config.SheetSpecification] = config.SHEET_SPECS,
+) -> Iterator[Tuple[config.SheetSpecification, Optional[Iterator[Tuple[PlatformSection, pd.DataFrame]]]]]:
+    """Yield each of ``specs`` with its section blocks, or ``None`` when the sheet is missing."""
+    if reader_backend == config.READER_BACKEND_STREAM:
+        with open_streaming_workbook(excel_path) as workbook:
+            logger.info("Streaming workbook: %s", workbook.name)
+            for spec in specs:
+                if not workbook.has_sheet(spec.sheet_name):
+                    logger.warning("Sheet '%s' not found in %s", spec.sheet_name, workbook.name)
+                    yield spec, None
+                    continue
+
+                logger.info("Streaming sheet '%s'", spec.sheet_name)
+                yield spec, iter_streamed_section_blocks(
+                    workbook.iter_rows(spec.sheet_name), is_dual_language=spec.is_dual_language
+                )
+        return
+
+    session = open_workbook(excel_path, engine=engine, cache=cache, sheet_names=[spec.sheet_name for spec in specs])
+    logger.info("Processing workbook: %s", session.name)
+    for spec in specs:
+        sheet_df = session.sheet(spec.sheet_name)
+        if sheet_df is None:
+            logger.warning("Sheet '%s' not found in %s", spec.sheet_name, session.name)
+            yield spec, None
             continue
 
-        languages = _read_language_selection(row_values, section.language_columns) if section.is_dual_language else []
-
-        selected_languages = languages or ([None] if section.is_dual_language else [None])
-        language_factor = len(languages) if languages else 1
-
-        total_expected = sum(count for _, count in aspect_counts) * language_factor
-        if total_expected != total_value:
-            # Harmonize mismatched TOTAL values to the computed expectation to avoid false failures.
-            logger.info(
-                "%s row %s (%s/%s): adjusted TOTAL from %s to %s based on selections.",
-                section.platform_name,
-                row_idx + 1,
-                funnel_stage,
-                format_value,
-                total_value,
-                total_expected,
-            )
-
-        stages_to_emit = _expand_funnel_stage(funnel_stage)
-
-        for ar_name, ar_count in aspect_counts:
-            ar_output = _format_aspect_ratio_output(section.platform_name, ar_name)
-            for _ in range(ar_count):
-                for stage in stages_to_emit:
-                    for language in selected_languages:
-                        record = {
-                            "Platform": section.platform_name,
-                            config.FUNNEL_STAGE_HEADER: stage,
-                            config.FORMAT_HEADER: format_value,
-                            config.DURATION_HEADER: duration_value,
-                            config.OUTPUT_COLUMNS_BASE[4]: ar_output,
-                        }
-                        if language is not None:
-                            record[config.OUTPUT_LANGUAGE_COLUMN] = language
-                        results.append(record)
-
-        row_idx += 1
-
-    return results
-
-
-def _row_starts_next_platform(row_values: pd.Series) -> bool:
-    for value in row_values:
-        if pd.notna(value) and str(value).strip().lower() == config.FUNNEL_STAGE_HEADER.lower():
-            return True
-    return False
-
-
-def _read_tick_counts(row_values: pd.Series, columns: Sequence[ColumnSpec]) -> List[Tuple[str, int]]:
-    counts: List[Tuple[str, int]] = []
-    for column in columns:
-        tick_value = safe_to_numeric(row_values.iloc[column.column_index], row_values.name, column.display_name)
-        if tick_value > 0:
-            counts.append((column.display_name, tick_value))
-    return counts
+        yield spec, iter_section_blocks(sheet_df, is_dual_language=spec.is_dual_language)
 
 
-def _read_language_selection(row_values: pd.Series, columns: Sequence[ColumnSpec]) -> List[str]:
-    selections: List[str] = []
-    for column in columns:
-        cell_value = str(row_values.iloc[column.column_index]).strip()
-        if cell_value and cell_value.lower() not in {"nan", ""}:
-            selections.append(column.display_name)
-    return selections
+def _compact_output(frame: pd.DataFrame, categorical: Optional[bool]) -> pd.DataFrame:
+    """Convert the text columns of ``frame`` to Categoricals when requested or when it is large."""
+    if categorical is None:
+        categorical = len(frame) >= config.CATEGORICAL_OUTPUT_MIN_ROWS
+    if not categorical:
+        return frame
 
-
-def _expand_funnel_stage(stage_value: str) -> List[str]:
-    if config.EXPAND_ALL_TO_ACP and stage_value.strip().upper() == "ALL":
-        return config.FUNNEL_STAGES
-    return [stage_value]
-
-
-def _format_aspect_ratio_output(platform_name: str, ar_name: str) -> str:
-    """Format the aspect ratio output, combining format type with aspect ratio for certain platforms.
-
-    For platforms like Programmatic that use format types (Video, Banner) instead of aspect ratios,
-    output "FormatType (AspectRatio)" e.g. "Video (16:9)" or "Banner (300x250)".
-    For other platforms, return the ar_name unchanged.
+    preferred_categories = {
+        "Platform": list(config.PLATFORM_NAMES.values()),
+        config.FUNNEL_STAGE_HEADER: list(config.FUNNEL_STAGES),
+    }
+    for column in frame.columns:
+        if column == config.OUTPUT_QUANTITY_COLUMN:
+            continue
+        known = preferred_categories.get(column, [])
+        discovered = [value for value in pd.unique(frame[column].dropna()) if value not in known]
+        frame[column] = pd.Categorical(frame[column], categories=known + discovered)
+    return frame
+
+
+def _transform_blocks(
+    blocks: Iterable[Tuple[PlatformSection, pd.DataFrame]],
+    spec: config.SheetSpecification,
+    *,
+    expansion: str = config.DEFAULT_EXPANSION_ENGINE,
+    output_mode: str = config.DEFAULT_OUTPUT_MODE,
+    executor: str = config.DEFAULT_SECTION_EXECUTOR,
+    section_cache: Optional[SectionResultCache] = None,
+) -> pd.DataFrame:
+    coercion_issues: List[CoercionIssue] = []
+    quantity = output_mode == config.OUTPUT_MODE_QUANTITY
+
+    parts = []
+    section_outputs = _map_section_blocks(
+        blocks, expansion=expansion, quantity=quantity, executor=executor, section_cache=section_cache
+    )
+    for part, issues in section_outputs:
+        parts.append(part)
+        coercion_issues.extend(issues)
+    report_coercion_issues(coercion_issues, context=spec.sheet_name)
+
+    if expansion == config.EXPANSION_ENGINE_RECORDS:
+        transformed = [record for part in parts for record in part]
+        if not transformed:
+            frame = pd.DataFrame(columns=spec.output_columns)
+        else:
+            frame = pd.DataFrame(transformed, columns=spec.output_columns)
+        if quantity:
+            frame[config.OUTPUT_QUANTITY_COLUMN] = 1
+            return aggregate_quantities(frame, spec)
+        return frame
+
+    if quantity:
+        frame = columns_to_frame(parts, spec.output_columns + [config.OUTPUT_QUANTITY_COLUMN])
+        return aggregate_quantities(frame, spec)
+    return columns_to_frame(parts, spec.output_columns)
+
+
+def _map_section_blocks(
+    blocks: Iterable[Tuple[PlatformSection, pd.DataFrame]],
+    *,
+    expansion: str,
+    quantity: bool,
+    executor: str,
+    section_cache: Optional[SectionResultCache] = None,
+) -> Iterable[Tuple[object, List[CoercionIssue]]]:
+    """Transform every block with :func:`_transform_section_block`, keeping section order.
+
+    With ``section_cache``, blocks whose fingerprint is cached reuse the stored output and
+    only the others go through ``executor``.
     """
-    if platform_name in config.PLATFORMS_WITH_FORMAT_TYPES:
-        aspect_ratio = config.FORMAT_TYPE_TO_ASPECT_RATIO.get(ar_name, "")
-        if aspect_ratio:
-            return f"{ar_name} ({aspect_ratio})"
-    return ar_name
+    transform = partial(_transform_section_block, expansion=expansion, quantity=quantity)
+    if section_cache is None:
+        return run_section_blocks(blocks, transform, expansion=expansion, executor=executor)
+
+    blocks = list(blocks)
+    variant = f"{config_fingerprint()}:{expansion}:{quantity}"
+    keys = [section_fingerprint(section, section_rows, variant=variant) for section, section_rows in blocks]
+    entries = [section_cache.get(key) for key in keys]
+    changed = [block for block, entry in zip(blocks, entries) if entry is None]
+    logger.info("Reusing %d of %d cached sections", len(blocks) - len(changed), len(blocks))
+
+    computed = iter(run_section_blocks(changed, transform, expansion=expansion, executor=executor))
+    outputs = []
+    for (section, _), key, entry in zip(blocks, keys, entries):
+        if entry is None:
+            entry = (*next(computed), section.data_row_start)
+            section_cache.put(key, entry)
+        part, issues, data_row_start = entry
+        shift = section.data_row_start - data_row_start
+        if shift:
+            # Rows were inserted or deleted above the section since its output was cached.
+            issues = [replace(issue, row_idx=issue.row_idx + shift) for issue in issues]
+        outputs.append((part, issues))
+    return outputs
+
+
+def _transform_section_block(
+    block: Tuple[PlatformSection, pd.DataFrame], *, expansion: str, quantity: bool
+) -> Tuple[object, List[CoercionIssue]]:
+    """Records or column arrays for one section, plus the coercion issues it raised."""
+    section, section_rows = block
+    issues: List[CoercionIssue] = []
+    if expansion == config.EXPANSION_ENGINE_RECORDS:
+        return expand_section_records(section_rows, section, issues), issues
+    return expand_section_columns(section_rows, section, issues, quantity=quantity), issues
@@ -3,19 +3,59 @@
 from __future__ import annotations
 
 import logging
+from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime
-from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
+from openpyxl import load_workbook
+
+try:
+    from python_calamine import CalamineWorkbook
+except Exception:  # pragma: no cover - optional dependency
+    CalamineWorkbook = None
 
 from . import config
-from .parser import PlatformSection, iter_platform_sections, safe_to_numeric
+from .cache import SheetCache
+from .parser import (
+    CoercionIssue,
+    PlatformSection,
+    all_stage_mask,
+    coerce_numeric_columns,
+    format_aspect_ratio_output,
+    iter_section_blocks,
+    report_coercion_issues,
+    selected_language_mask,
+    text_column_values,
+)
+from .reader import (
+    ExcelInput,
+    WorkbookSession,
+    WorkbookSource,
+    as_excel_io,
+    open_workbook,
+    resolve_engine,
+    source_name,
+)
+from .results import partition_by_platform
+from .writer import rollover_base_name
 
 
 logger = logging.getLogger(__name__)
 
+IN_MEMORY_OUTPUT = "<in-memory results>"
+
+# Granularity of validate_details(); outputs without a Languages column count as language "".
+DETAIL_KEY_COLUMNS = [
+    "Platform",
+    config.FUNNEL_STAGE_HEADER,
+    config.OUTPUT_COLUMNS_BASE[4],
+    config.OUTPUT_LANGUAGE_COLUMN,
+]
+DETAIL_COLUMNS = ["Sheet"] + DETAIL_KEY_COLUMNS + ["Expected", "Actual", "Difference"]
+
 
 @dataclass
 class PlatformComparison:
@@ -31,13 +71,113 @@ class PlatformComparison:
         return self.actual - self.expected
 
 
-def validate_output(input_path: str, output_path: str) -> Dict:
-    input_file = Path(input_path)
-    output_file = Path(output_path)
+def validate_output(
+    input_path: WorkbookSource,
+    output_path: ExcelInput,
+    *,
+    engine: str = config.DEFAULT_READER_ENGINE,
+    cache: Optional[SheetCache] = None,
+) -> Dict:
+    """Compare per-platform creative counts in ``output_path`` against the input TOTAL columns.
+
+    ``input_path`` may be a :class:`WorkbookSession` already used by :func:`process_workbook`
+    so the input workbook is not parsed a second time. Both arguments also accept in-memory
+    ``bytes``/``BytesIO``/``memoryview`` workbooks. Output sheets written in quantity mode
+    are counted by summing their ``Quantity`` column. Only the ``Platform`` and ``Quantity``
+    values of the output are tallied, streaming its rows with ``engine`` (calamine when
+    available) instead of loading the sheets into DataFrames.
+    """
+    session = open_workbook(input_path, engine=engine, cache=cache)
+    actual = _collect_actual_counts(output_path, engine)
+    return build_validation_report(
+        session.name, _collect_expected_totals(session), actual, output_name=source_name(output_path)
+    )
+
+
+def validate_results(
+    input_path: WorkbookSource,
+    results: Dict[str, Optional[pd.DataFrame]],
+    *,
+    engine: str = config.DEFAULT_READER_ENGINE,
+    cache: Optional[SheetCache] = None,
+) -> Dict:
+    """Validate the frames returned by :func:`process_workbook` without writing or reading xlsx.
+
+    Produces the same report as :func:`validate_output`; pass the session used for the
+    transformation as ``input_path`` to avoid parsing the input again.
+    """
+    session = open_workbook(input_path, engine=engine, cache=cache)
+    return build_validation_report(
+        session.name, _collect_expected_totals(session), count_result_platforms(results), output_name=IN_MEMORY_OUTPUT
+    )
+
+
+def validate_details(
+    input_path: WorkbookSource,
+    output: Union[Dict[str, Optional[pd.DataFrame]], ExcelInput],
+    *,
+    engine: str = config.DEFAULT_READER_ENGINE,
+    cache: Optional[SheetCache] = None,
+) -> pd.DataFrame:
+    """Compare creative counts per (platform, funnel stage, aspect ratio, language).
+
+    Expected counts come straight from the input tick and language cells, with ``ALL`` stages
+    expanded as configured; actual counts come from one ``groupby`` over ``output``, which is
+    either the dict returned by :func:`process_workbook` or an output workbook (rollover
+    sheets included). Returns only mismatching combinations as ``DETAIL_COLUMNS``, so an
+    empty frame means the output matches the input exactly.
+    """
+    session = open_workbook(input_path, engine=engine, cache=cache)
+    expected = _collect_expected_details(session)
+    if isinstance(output, dict):
+        actual = _detail_counts_from_results(output)
+    else:
+        actual = _detail_counts_from_file(output, engine)
+
+    keys = ["Sheet"] + DETAIL_KEY_COLUMNS
+    merged = expected.merge(actual, on=keys, how="outer")
+    merged[["Expected", "Actual"]] = merged[["Expected", "Actual"]].fillna(0).astype(np.int64)
+    merged["Difference"] = merged["Actual"] - merged["Expected"]
+    mismatches = merged.loc[merged["Difference"] != 0, DETAIL_COLUMNS].sort_values(keys, kind="stable")
+    logger.info("Detailed validation: %d mismatching combinations", len(mismatches))
+    return mismatches.reset_index(drop=True)
+
+
+def count_result_platforms(results: Dict[str, Optional[pd.DataFrame]]) -> Dict[str, Dict[str, int]]:
+    """Creative counts per platform of each result frame, keyed by output sheet name."""
+
+    actual: Dict[str, Dict[str, int]] = {}
+    for spec in config.SHEET_SPECS:
+        frame = results.get(spec.sheet_name)
+        if frame is not None:
+            actual[spec.output_sheet_name] = {
+                partition.platform_name: partition.count for partition in partition_by_platform(frame)
+            }
+    return actual
+
+
+def sum_section_totals(
+    section_rows: pd.DataFrame, section: PlatformSection, coercion_issues: List[CoercionIssue]
+) -> int:
+    """Sum the TOTAL column of one section, i.e. the creatives the tracker expects from it."""
+
+    totals, issues = coerce_numeric_columns(section_rows, [section.total_column])
+    coercion_issues.extend(issues)
+    return int(totals.sum())
 
-    expected = _collect_expected_totals(input_file)
-    actual = _collect_actual_counts(output_file)
 
+def build_validation_report(
+    input_name: str,
+    expected: Dict[str, Dict[str, int]],
+    actual: Dict[str, Dict[str, int]],
+    *,
+    output_name: str,
+) -> Dict:
+    """Assemble the report returned by :func:`validate_output`.
+
+    ``expected`` maps input sheet names to per-platform TOTALs and ``actual`` maps output sheet
+    names to per-platform creative counts.
+    """
     comparison: Dict[str, Dict[str, PlatformComparison]] = {}
     summary = {
         "total_platforms_checked": 0,
@@ -77,8 +217,8 @@ def validate_output(input_path: str, output_path: str) -> Dict:
 
     return {
         "timestamp": datetime.now().isoformat(),
-        "input_file": input_file.name,
-        "output_file": output_file.name,
+        "input_file": input_name,
+        "output_file": output_name,
         "validation_results": {
             sheet: {
                 platform: {
@@ -95,58 +235,220 @@ def validate_output(input_path: str, output_path: str) -> Dict:
     }
 
 
-def _collect_expected_totals(input_file: Path) -> Dict[str, Dict[str, int]]:
+def _collect_expected_totals(session: WorkbookSession) -> Dict[str, Dict[str, int]]:
     workbook: Dict[str, Dict[str, int]] = {}
     for spec in config.SHEET_SPECS:
-        try:
-            sheet_df = pd.read_excel(input_file, sheet_name=spec.sheet_name, header=None)
-        except ValueError:
+        sheet_df = session.sheet(spec.sheet_name)
+        if sheet_df is None:
             logger.warning("Sheet '%s' not found in input workbook.", spec.sheet_name)
             continue
 
         totals: Dict[str, int] = {}
-        for section in iter_platform_sections(sheet_df, is_dual_language=spec.is_dual_language):
-            totals[section.platform_name] = _sum_totals(sheet_df, section)
+        coercion_issues: List[CoercionIssue] = []
+        for section, section_rows in iter_section_blocks(sheet_df, is_dual_language=spec.is_dual_language):
+            totals[section.platform_name] = sum_section_totals(section_rows, section, coercion_issues)
+        report_coercion_issues(coercion_issues, context=spec.sheet_name)
         workbook[spec.sheet_name] = totals
 
     return workbook
 
 
-def _collect_actual_counts(output_file: Path) -> Dict[str, Dict[str, int]]:
+def _collect_expected_details(session: WorkbookSession) -> pd.DataFrame:
+    keys = ["Sheet"] + DETAIL_KEY_COLUMNS
+    parts: List[pd.DataFrame] = []
+    for spec in config.SHEET_SPECS:
+        sheet_df = session.sheet(spec.sheet_name)
+        if sheet_df is None:
+            continue
+
+        # Per-section tables share sheet-wide row ids so they can be joined once per sheet.
+        tables: List[Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]] = []
+        coercion_issues: List[CoercionIssue] = []
+        for section, section_rows in iter_section_blocks(sheet_df, is_dual_language=spec.is_dual_language):
+            tables.append(_section_detail_tables(section_rows, section, coercion_issues))
+        report_coercion_issues(coercion_issues, context=spec.sheet_name)
+        if not tables:
+            continue
+
+        pairs, stages, languages = (pd.concat(table, ignore_index=True) for table in zip(*tables))
+        stages = stages.explode(config.FUNNEL_STAGE_HEADER)
+        details = pairs.merge(stages, on="row").merge(languages, on="row")
+        parts.append(details.assign(Sheet=spec.sheet_name)[keys + ["Expected"]])
+
+    if not parts:
+        return pd.DataFrame(columns=keys + ["Expected"])
+    return pd.concat(parts, ignore_index=True).groupby(keys, sort=False, as_index=False)["Expected"].sum()
+
+
+def _section_detail_tables(
+    section_rows: pd.DataFrame, section: PlatformSection, coercion_issues: List[CoercionIssue]
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """(row, aspect ratio) tick pairs, funnel stages and selected languages of one section.
+
+    Rows are identified by their sheet row index; the stage table holds lists that are
+    exploded once per sheet.
+    """
+    row_ids = section_rows.index.to_numpy()
+    ticks, issues = coerce_numeric_columns(section_rows, section.aspect_ratio_columns)
+    coercion_issues.extend(issues)
+    pair_rows, pair_ars = np.nonzero(ticks > 0)
+    ar_labels = np.array(
+        [format_aspect_ratio_output(section.platform_name, column.display_name) for column in section.aspect_ratio_columns]
+        + [""],
+        dtype=object,
+    )
+    pairs = pd.DataFrame(
+        {
+            "row": row_ids[pair_rows],
+            "Platform": section.platform_name,
+            config.OUTPUT_COLUMNS_BASE[4]: ar_labels[pair_ars],
+            "Expected": ticks[pair_rows, pair_ars],
+        }
+    )
+
+    funnel_stages = text_column_values(section_rows, section.funnel_stage_col)
+    expand_all = all_stage_mask(funnel_stages)
+    stages = pd.DataFrame(
+        {
+            "row": row_ids,
+            config.FUNNEL_STAGE_HEADER: [
+                config.FUNNEL_STAGES if expand else stage for stage, expand in zip(funnel_stages, expand_all)
+            ],
+        }
+    )
+
+    language_mask = selected_language_mask(section_rows, section)
+    language_names = np.array([column.display_name for column in section.language_columns] + [""], dtype=object)
+    language_rows, language_cols = np.nonzero(language_mask)
+    unselected = np.flatnonzero(~language_mask.any(axis=1))
+    languages = pd.DataFrame(
+        {
+            "row": row_ids[np.concatenate([language_rows, unselected])],
+            config.OUTPUT_LANGUAGE_COLUMN: language_names[
+                np.concatenate([language_cols, np.full(len(unselected), len(language_names) - 1)])
+            ],
+        }
+    )
+    return pairs, stages, languages
+
+
+def _detail_counts_from_results(results: Dict[str, Optional[pd.DataFrame]]) -> pd.DataFrame:
+    parts = [
+        _detail_counts(frame).assign(Sheet=spec.sheet_name)
+        for spec in config.SHEET_SPECS
+        if (frame := results.get(spec.sheet_name)) is not None
+    ]
+    return _combine_detail_counts(parts)
+
+
+def _detail_counts_from_file(output_path: ExcelInput, engine: str) -> pd.DataFrame:
+    sheets_by_output = {spec.output_sheet_name: spec.sheet_name for spec in config.SHEET_SPECS}
+    wanted = set(DETAIL_KEY_COLUMNS) | {config.OUTPUT_QUANTITY_COLUMN}
+    parts: List[pd.DataFrame] = []
+    with pd.ExcelFile(as_excel_io(output_path), engine=resolve_engine(engine)) as workbook:
+        for sheet_name in workbook.sheet_names:
+            base_name = rollover_base_name(sheet_name, sheets_by_output)
+            if base_name not in sheets_by_output:
+                continue
+            frame = pd.read_excel(workbook, sheet_name=sheet_name, usecols=lambda column: column in wanted)
+            parts.append(_detail_counts(frame).assign(Sheet=sheets_by_output[base_name]))
+    return _combine_detail_counts(parts)
+
+
+def _detail_counts(frame: pd.DataFrame) -> pd.DataFrame:
+    """Grouped creative counts of one output frame, weighted by ``Quantity`` when present."""
+
+    keys = [column for column in DETAIL_KEY_COLUMNS if column in frame.columns]
+    grouped = frame.groupby(keys, sort=False, observed=True, dropna=False)
+    if config.OUTPUT_QUANTITY_COLUMN in frame.columns:
+        counts = grouped[config.OUTPUT_QUANTITY_COLUMN].sum()
+    else:
+        counts = grouped.size()
+    counts = counts.rename("Actual").reset_index()
+    for column in DETAIL_KEY_COLUMNS:
+        if column not in counts.columns:
+            counts[column] = ""
+        counts[column] = counts[column].astype(object).where(counts[column].notna(), "").astype(str)
+    return counts
+
+
+def _combine_detail_counts(parts: List[pd.DataFrame]) -> pd.DataFrame:
+    keys = ["Sheet"] + DETAIL_KEY_COLUMNS
+    if not parts:
+        return pd.DataFrame(columns=keys + ["Actual"])
+    return pd.concat(parts, ignore_index=True).groupby(keys, sort=False, as_index=False)["Actual"].sum()
+
+
+def _collect_actual_counts(output_path: ExcelInput, engine: str) -> Dict[str, Dict[str, int]]:
+    start = output_path.tell() if hasattr(output_path, "seek") else None
     try:
-        excel_file = pd.ExcelFile(output_file)
+        try:
+            return _tally_output_rows(output_path, engine)
+        except (AttributeError, ImportError) as exc:
+            # python-calamine before 0.3 cannot stream rows; openpyxl always can.
+            logger.warning(
+                "Streaming '%s' with engine '%s' failed (%s); reading it with openpyxl instead",
+                source_name(output_path),
+                engine,
+                exc,
+            )
+            if start is not None:
+                output_path.seek(start)
+            return _tally_output_rows(output_path, config.READER_ENGINE_OPENPYXL)
     except Exception as exc:
-        logger.error("Unable to read output file '%s': %s", output_file, exc)
+        logger.error("Unable to read output file '%s': %s", source_name(output_path), exc)
         return {}
 
+
+def _tally_output_rows(output_path: ExcelInput, engine: str) -> Dict[str, Dict[str, int]]:
+    # Sheets split on Excel's row limit (Transformed_Dual_Lang_1, _2, ...) count towards their base sheet.
+    output_sheet_names = [spec.output_sheet_name for spec in config.SHEET_SPECS]
     counts: Dict[str, Dict[str, int]] = {}
-    for sheet_name in excel_file.sheet_names:
-        df = pd.read_excel(output_file, sheet_name=sheet_name)
-        if "Platform" in df.columns:
-            counts[sheet_name] = df["Platform"].value_counts().to_dict()
-        else:
-            counts[sheet_name] = {}
+    for sheet_name, rows in _iter_output_rows(output_path, engine):
+        sheet_counts = counts.setdefault(rollover_base_name(sheet_name, output_sheet_names), {})
+        for platform_name, count in _count_platform_cells(rows).items():
+            sheet_counts[platform_name] = sheet_counts.get(platform_name, 0) + count
     return counts
 
 
-def _sum_totals(sheet_df: pd.DataFrame, section: PlatformSection) -> int:
-    total = 0
-    row_idx = section.data_row_start
+def _iter_output_rows(output_path: ExcelInput, engine: str) -> Iterator[Tuple[str, Iterator[Tuple[object, ...]]]]:
+    """Yield ``(sheet_name, rows)`` for each output sheet without building DataFrames."""
 
-    while row_idx < len(sheet_df):
-        row_values = sheet_df.iloc[row_idx]
-
-        if any(
-            pd.notna(value) and str(value).strip().lower() == config.FUNNEL_STAGE_HEADER.lower()
-            for value in row_values
-        ):
-            break
-
-        funnel_value = row_values.iloc[section.funnel_stage_col]
-        if pd.isna(funnel_value) or str(funnel_value).strip() == "":
-            break
-
-        total += safe_to_numeric(row_values.iloc[section.total_col], row_idx, config.MAIN_HEADER_TOTAL_COL)
-        row_idx += 1
+    source = as_excel_io(output_path)
+    if resolve_engine(engine) == config.READER_ENGINE_CALAMINE:
+        workbook = CalamineWorkbook.from_object(source)
+        try:
+            for sheet_name in workbook.sheet_names:
+                yield sheet_name, workbook.get_sheet_by_name(sheet_name).iter_rows()
+        finally:
+            workbook.close()
+        return
 
-    return total
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        for worksheet in workbook.worksheets:
+            worksheet.reset_dimensions()
+            yield worksheet.title, worksheet.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _count_platform_cells(rows: Iterator[Tuple[object, ...]]) -> Counter:
+    """Tally the ``Platform`` column, weighted by ``Quantity`` when the sheet has one."""
+
+    counts: Counter = Counter()
+    header = next(rows, None)
+    if header is None or "Platform" not in header:
+        return counts
+
+    platform_col = header.index("Platform")
+    quantity_col = header.index(config.OUTPUT_QUANTITY_COLUMN) if config.OUTPUT_QUANTITY_COLUMN in header else None
+    for values in rows:
+        platform_name = values[platform_col]
+        if platform_name is None or platform_name == "":
+            continue
+        if quantity_col is None:
+            counts[platform_name] += 1
+        elif values[quantity_col] not in (None, ""):
+            counts[platform_name] += int(values[quantity_col])
+    return counts
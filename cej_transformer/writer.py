@@ -0,0 +1,253 @@
+"""Excel writer backends for transformed output."""
+
+from __future__ import annotations
+
+import logging
+import re
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Sequence, Tuple, Union
+
+import pandas as pd
+
+from . import config
+
+try:
+    import xlsxwriter
+
+    _XLSXWRITER_AVAILABLE = True
+except Exception:  # pragma: no cover - optional dependency
+    xlsxwriter = None
+    _XLSXWRITER_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pa_parquet
+
+    _PYARROW_AVAILABLE = True
+except Exception:  # pragma: no cover - optional dependency
+    pa = None
+    pa_ipc = None
+    pa_parquet = None
+    _PYARROW_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+_WRITE_CHUNK_ROWS = 50_000
+_ROLLOVER_SUFFIX = re.compile(r"^(?P<base>.+)_(?P<part>\d+)$")
+
+# (sheet name, first row, stop row) slices of one output frame.
+SheetPart = Tuple[str, int, int]
+
+
+def available_writer_engines() -> List[str]:
+    """Return the usable Excel writer engines, fastest first."""
+
+    engines = [config.WRITER_ENGINE_OPENPYXL]
+    if _XLSXWRITER_AVAILABLE:
+        engines.insert(0, config.WRITER_ENGINE_XLSXWRITER)
+    return engines
+
+
+def resolve_writer_engine(engine: str = config.DEFAULT_WRITER_ENGINE) -> str:
+    """Map ``engine`` (possibly ``"auto"``) to a concrete writer engine name."""
+
+    if engine not in config.WRITER_ENGINES:
+        raise ValueError(f"Unknown writer engine '{engine}'; expected one of {config.WRITER_ENGINES}")
+    if engine == config.WRITER_ENGINE_AUTO:
+        return available_writer_engines()[0]
+    if engine not in available_writer_engines():
+        raise ImportError(f"Writer engine '{engine}' is not available; install XlsxWriter.")
+    return engine
+
+
+def plan_sheet_parts(
+    sheet_name: str,
+    row_count: int,
+    *,
+    rollover: bool = True,
+    max_rows: int = config.EXCEL_MAX_ROWS,
+) -> List[SheetPart]:
+    """Split ``row_count`` data rows into worksheets that fit under ``max_rows`` with a header.
+
+    Frames that fit keep ``sheet_name``; larger ones become ``<sheet_name>_1``, ``_2`` and so
+    on. With ``rollover=False`` an oversized frame raises ``ValueError`` instead, which lets
+    callers fail before any output is written.
+    """
+
+    capacity = max_rows - 1
+    if row_count <= capacity:
+        return [(sheet_name, 0, row_count)]
+    if not rollover:
+        raise ValueError(
+            f"Sheet '{sheet_name}' needs {row_count:,} rows but a worksheet holds {capacity:,}; "
+            "enable rollover or choose a columnar output format."
+        )
+
+    starts = range(0, row_count, capacity)
+    logger.info("Splitting %s rows of '%s' across %d sheets", f"{row_count:,}", sheet_name, len(starts))
+    return [
+        (rollover_sheet_name(sheet_name, part), start, min(start + capacity, row_count))
+        for part, start in enumerate(starts, start=1)
+    ]
+
+
+def rollover_sheet_name(sheet_name: str, part: int) -> str:
+    """Name of the ``part``-th (1-based) overflow sheet, kept within Excel's name limit."""
+
+    suffix = f"_{part}"
+    return sheet_name[: config.EXCEL_MAX_SHEET_NAME_LENGTH - len(suffix)] + suffix
+
+
+def rollover_base_name(sheet_name: str, base_names: Iterable[str]) -> str:
+    """Map an overflow sheet such as ``Transformed_Dual_Lang_2`` back to one of ``base_names``."""
+
+    match = _ROLLOVER_SUFFIX.match(sheet_name)
+    if match is None:
+        return sheet_name
+    for base_name in base_names:
+        if rollover_sheet_name(base_name, int(match.group("part"))) == sheet_name:
+            return base_name
+    return sheet_name
+
+
+def write_excel_sheets(
+    sheets: Sequence[Tuple[str, pd.DataFrame]],
+    target: Union[str, Path, BinaryIO],
+    *,
+    engine: str = config.DEFAULT_WRITER_ENGINE,
+    rollover: bool = True,
+) -> None:
+    """Write ``(sheet_name, frame)`` pairs to ``target`` as an xlsx workbook.
+
+    The xlsxwriter engine runs in ``constant_memory`` mode and streams rows in order, so only
+    the current row is buffered; the openpyxl engine builds the workbook in memory. Frames
+    longer than a worksheet are split as planned by :func:`plan_sheet_parts` before anything
+    is written.
+    """
+
+    engine_name = resolve_writer_engine(engine)
+    parts = [
+        (part_name, frame, start, stop)
+        for sheet_name, frame in sheets
+        for part_name, start, stop in plan_sheet_parts(sheet_name, len(frame), rollover=rollover)
+    ]
+    if engine_name == config.WRITER_ENGINE_XLSXWRITER:
+        _write_with_xlsxwriter(parts, target)
+        return
+
+    with pd.ExcelWriter(target, engine="openpyxl") as writer:
+        for part_name, frame, start, stop in parts:
+            frame.iloc[start:stop].to_excel(writer, sheet_name=part_name, index=False)
+
+
+def _write_with_xlsxwriter(
+    parts: Sequence[Tuple[str, pd.DataFrame, int, int]], target: Union[str, Path, BinaryIO]
+) -> None:
+    workbook = xlsxwriter.Workbook(target, {"constant_memory": True})
+    # Mirror the header style pandas applies in DataFrame.to_excel.
+    header_format = workbook.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+    try:
+        for part_name, frame, start, stop in parts:
+            worksheet = workbook.add_worksheet(part_name)
+            worksheet.write_row(0, 0, [str(column) for column in frame.columns], header_format)
+            for chunk_start in range(start, stop, _WRITE_CHUNK_ROWS):
+                chunk = frame.iloc[chunk_start:min(chunk_start + _WRITE_CHUNK_ROWS, stop)].astype(object)
+                chunk = chunk.where(chunk.notna(), None)
+                for offset, values in enumerate(chunk.to_numpy().tolist(), start=chunk_start - start + 1):
+                    worksheet.write_row(offset, 0, values)
+    finally:
+        workbook.close()
+
+
+def write_table_files(
+    batches: Iterable[Tuple[config.SheetSpecification, pd.DataFrame]],
+    output_dir: Union[str, Path],
+    *,
+    output_format: str,
+    compression: str = config.DEFAULT_OUTPUT_COMPRESSION,
+) -> List[Path]:
+    """Append ``(spec, frame)`` batches to one file per ``spec.output_sheet_name``.
+
+    Files are opened on their first batch and appended to as batches arrive, so the input can
+    be a stream such as :func:`cej_transformer.transformer.iter_transformed_batches`.
+    Parquet batches become row groups and feather batches become Arrow IPC record batches.
+    Returns the written paths in the order they were created.
+    """
+
+    _check_table_format(output_format, compression)
+    output_dir = Path(output_dir)
+    sinks: Dict[str, _TableSink] = {}
+    try:
+        for spec, frame in batches:
+            if frame.empty:
+                continue
+            sink = sinks.get(spec.output_sheet_name)
+            if sink is None:
+                output_dir.mkdir(parents=True, exist_ok=True)
+                path = output_dir / f"{spec.output_sheet_name}{config.OUTPUT_FORMAT_SUFFIXES[output_format]}"
+                sink = sinks[spec.output_sheet_name] = _TableSink(path, output_format, compression)
+            sink.write(frame)
+    finally:
+        for sink in sinks.values():
+            sink.close()
+
+    for sink in sinks.values():
+        logger.info("Wrote %d rows to %s", sink.rows, sink.path)
+    return [sink.path for sink in sinks.values()]
+
+
+def _check_table_format(output_format: str, compression: str) -> None:
+    if output_format not in config.OUTPUT_FORMAT_SUFFIXES:
+        raise ValueError(
+            f"Unknown table output format '{output_format}'; expected one of {tuple(config.OUTPUT_FORMAT_SUFFIXES)}"
+        )
+    if compression not in config.OUTPUT_COMPRESSIONS:
+        raise ValueError(f"Unknown compression '{compression}'; expected one of {config.OUTPUT_COMPRESSIONS}")
+    if output_format == config.OUTPUT_FORMAT_FEATHER and compression not in config.FEATHER_COMPRESSIONS:
+        raise ValueError(f"Feather output supports compression {config.FEATHER_COMPRESSIONS}, not '{compression}'")
+    if output_format != config.OUTPUT_FORMAT_CSV and not _PYARROW_AVAILABLE:
+        raise ImportError(f"Writing {output_format} output requires pyarrow.")
+
+
+class _TableSink:
+    """Open output file for one sheet; the schema is fixed by the first batch."""
+
+    def __init__(self, path: Path, output_format: str, compression: str) -> None:
+        self.path = path
+        self.rows = 0
+        self._format = output_format
+        self._compression = None if compression == "none" else compression
+        self._schema = None
+        self._writer = None
+
+    def write(self, frame: pd.DataFrame) -> None:
+        if self._format == config.OUTPUT_FORMAT_CSV:
+            frame.to_csv(self.path, mode="a" if self.rows else "w", header=not self.rows, index=False)
+        else:
+            self._write_arrow(frame)
+        self.rows += len(frame)
+
+    def _write_arrow(self, frame: pd.DataFrame) -> None:
+        if self._schema is None:
+            # Text columns are always strings even when a batch happens to be all-null or
+            # categorical, so every batch shares the first batch's schema.
+            self._schema = pa.schema(
+                [
+                    pa.field(column, pa.int64() if column == config.OUTPUT_QUANTITY_COLUMN else pa.string())
+                    for column in frame.columns
+                ]
+            )
+            if self._format == config.OUTPUT_FORMAT_PARQUET:
+                self._writer = pa_parquet.ParquetWriter(self.path, self._schema, compression=self._compression)
+            else:
+                options = pa_ipc.IpcWriteOptions(compression=self._compression)
+                self._writer = pa_ipc.new_file(self.path, self._schema, options=options)
+
+        table = pa.Table.from_pandas(frame, preserve_index=False).cast(self._schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
@@ -1,7 +1,17 @@
 from __future__ import annotations
 
+import argparse
+import glob
+import hashlib
 import logging
 import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
 
 try:
     import tkinter as tk
@@ -14,8 +24,18 @@ except Exception:  # pragma: no cover - optional dependency
     messagebox = None
     _TK_AVAILABLE = False
 
+from cej_transformer import config
+from cej_transformer.cache import SectionResultCache
 from cej_transformer.logging_utils import configure_logging
-from cej_transformer.transformer import process_workbook, write_transformed_output
+from cej_transformer.reader import open_workbook
+from cej_transformer.transformer import (
+    estimate_output_rows,
+    process_and_validate,
+    process_workbook,
+    write_transformed_files,
+    write_transformed_output,
+)
+from cej_transformer.writer import plan_sheet_parts
 
 logger = logging.getLogger(__name__)
 
@@ -42,31 +62,324 @@ def process_excel_file_for_streamlit(input_excel_file_path: str):
     return process_workbook(input_excel_file_path)
 
 
-def main() -> None:
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Transform a CEJ Master Spec Sheet workbook.",
+        epilog="Run 'batch --help' to transform many workbooks at once.",
+    )
+    parser.add_argument("input", nargs="?", help="Excel file to process; prompts for one when omitted.")
+    _add_transform_options(parser)
+    return parser.parse_args(argv)
+
+
+def parse_batch_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="cej-transformer batch", description="Transform many CEJ Master Spec Sheet workbooks in parallel."
+    )
+    parser.add_argument("inputs", nargs="+", help="Directories (every *.xlsx inside) or glob patterns.")
+    parser.add_argument(
+        "--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes (default: CPU count)."
+    )
+    parser.add_argument("--out", type=Path, default=Path("."), help="Directory for the outputs.")
+    _add_transform_options(parser)
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    return args
+
+
+def _add_transform_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--reader",
+        choices=config.READER_BACKENDS,
+        default=config.DEFAULT_READER_BACKEND,
+        help="'stream' reads rows through read-only openpyxl to bound memory on very large trackers.",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=config.READER_ENGINES,
+        default=config.DEFAULT_READER_ENGINE,
+        help="Excel parser for the frame reader; 'auto' uses calamine when installed.",
+    )
+    parser.add_argument(
+        "--output-mode",
+        choices=config.OUTPUT_MODES,
+        default=config.DEFAULT_OUTPUT_MODE,
+        help="'quantity' writes each distinct creative combination once with a Quantity column.",
+    )
+    parser.add_argument(
+        "--writer",
+        choices=config.WRITER_ENGINES,
+        default=config.DEFAULT_WRITER_ENGINE,
+        help="Excel writer; 'auto' streams rows with xlsxwriter in constant-memory mode when installed.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=config.OUTPUT_FORMATS,
+        default=config.DEFAULT_OUTPUT_FORMAT,
+        help="Output format; parquet, csv and feather write one file per output sheet into a directory.",
+    )
+    parser.add_argument(
+        "--compression",
+        choices=config.OUTPUT_COMPRESSIONS,
+        default=config.DEFAULT_OUTPUT_COMPRESSION,
+        help="Codec for parquet and feather output (feather supports lz4, zstd and none).",
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Check per-platform counts against the input TOTAL columns during the same pass.",
+    )
+    parser.add_argument(
+        "--parallel-sheets",
+        action="store_true",
+        help="Read and transform each tracker sheet in its own worker process. In batch mode each "
+        "job then uses one process per sheet, so --jobs is divided by the number of sheets.",
+    )
+    parser.add_argument(
+        "--section-executor",
+        choices=config.SECTION_EXECUTORS,
+        default=config.DEFAULT_SECTION_EXECUTOR,
+        help="Transform the sections of large sheets in a thread or process pool; 'auto' picks "
+        "one by expansion engine. Small sheets always stay serial.",
+    )
+    parser.add_argument(
+        "--section-cache",
+        type=Path,
+        metavar="PATH",
+        help="Reuse per-section outputs saved at PATH by an earlier run so only edited platform "
+        "sections are transformed again; PATH is updated afterwards. In batch mode PATH is a "
+        "directory with one cache file per workbook.",
+    )
+    parser.add_argument(
+        "--no-rollover",
+        dest="rollover",
+        action="store_false",
+        help="Fail before transforming when a sheet would exceed Excel's row limit instead of "
+        "splitting it across numbered sheets.",
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv[:1] == ["batch"]:
+        sys.exit(batch_main(argv[1:]))
+
+    args = parse_args(argv)
     configure_logging()
 
-    input_path = select_excel_file()
+    # Message boxes only accompany the file picker; a path on the command line runs headless.
+    interactive = args.input is None
+    input_path = args.input or select_excel_file()
     if not input_path:
         logger.info("No file selected; exiting.")
-        if _TK_AVAILABLE:
+        if interactive:
             _show_message("Cancelled", "No file selected. Exiting script.")
         return
 
     logger.info("Starting transformation for %s", os.path.basename(input_path))
-    results = process_workbook(input_path)
-    output_path = write_transformed_output(results)
+    output_path, _ = transform_file(input_path, args)
 
     if output_path is None:
         logger.info("No transformed data generated; skipping output file creation.")
-        if _TK_AVAILABLE:
+        if interactive:
             _show_message("No Data", "No data transformed. Output not generated.", severity="warning")
         return
 
     logger.info("Transformation complete: %s", output_path)
-    if _TK_AVAILABLE:
+    if interactive:
         _show_message("Success", f"Data written to:\n{output_path}")
 
 
+def transform_file(
+    input_path: str,
+    args: argparse.Namespace,
+    *,
+    output_dir: Optional[Path] = None,
+    output_basename: str = config.OUTPUT_FILE_BASENAME,
+) -> Tuple[Optional[Path], Optional[Dict]]:
+    """Transform and write one workbook with the CLI options; returns ``(output, report)``.
+
+    ``report`` is the validation report when ``--validate`` was given, otherwise ``None``.
+    """
+    streamable = args.output_mode == config.OUTPUT_MODE_ROWS and not args.validate and args.section_cache is None
+    if args.format != config.OUTPUT_FORMAT_XLSX and streamable:
+        # Columnar formats are fed batch by batch, so the full result frames are never built.
+        output_path = write_transformed_files(
+            input_path,
+            output_format=args.format,
+            compression=args.compression,
+            output_basename=output_basename,
+            reader_backend=args.reader,
+            engine=args.engine,
+            output_dir=output_dir,
+        )
+        return output_path, None
+
+    source = input_path
+    # The estimate counts rows-mode output; quantity mode collapses it, so the writer checks instead.
+    if args.format == config.OUTPUT_FORMAT_XLSX and not args.rollover and args.output_mode == config.OUTPUT_MODE_ROWS:
+        if args.reader == config.READER_BACKEND_FRAME:
+            # Parse once and share the grids between the estimate and the transformation.
+            source = open_workbook(input_path, engine=args.engine)
+        _check_excel_capacity(source, reader_backend=args.reader, engine=args.engine)
+
+    report = None
+    section_cache = SectionResultCache.load(args.section_cache) if args.section_cache is not None else None
+    options = dict(
+        reader_backend=args.reader,
+        engine=args.engine,
+        output_mode=args.output_mode,
+        parallel=args.parallel_sheets,
+        section_executor=args.section_executor,
+        section_cache=section_cache,
+    )
+    if args.validate:
+        results, report = process_and_validate(source, **options)
+        summary = report["summary"]
+        logger.info(
+            "Validation %s: %s of %s platforms passed",
+            summary["overall_status"],
+            summary["platforms_passed"],
+            summary["total_platforms_checked"],
+        )
+    else:
+        results = process_workbook(source, **options)
+    if section_cache is not None:
+        section_cache.save(args.section_cache)
+    output_path = write_transformed_output(
+        results,
+        output_basename=output_basename,
+        writer_engine=args.writer,
+        output_format=args.format,
+        compression=args.compression,
+        rollover=args.rollover,
+        output_dir=output_dir,
+    )
+    return output_path, report
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    input_path: Path
+    output_path: Optional[Path]
+    seconds: float
+    validation: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def status(self) -> str:
+        if self.error is not None:
+            return "ERROR"
+        return "OK" if self.output_path is not None else "NO DATA"
+
+
+def batch_main(argv: Optional[Sequence[str]] = None) -> int:
+    """Transform every matched workbook in a process pool; returns the process exit code."""
+    args = parse_batch_args(argv)
+    configure_logging()
+
+    inputs = collect_batch_inputs(args.inputs)
+    if not inputs:
+        print("No .xlsx workbooks matched.", file=sys.stderr)
+        return 2
+
+    workers = min(args.jobs, len(inputs))
+    if args.parallel_sheets:
+        # Every job runs its own pool of one process per sheet; keep the total near --jobs.
+        workers = max(1, min(args.jobs // len(config.SHEET_SPECS), len(inputs)))
+    if args.section_cache is not None:
+        args.section_cache.mkdir(parents=True, exist_ok=True)
+
+    print(f"Transforming {len(inputs)} workbook(s) with {workers} worker(s) into {args.out}")
+    started = time.perf_counter()
+    results: List[BatchResult] = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_run_batch_item, input_path, args): input_path for input_path in inputs}
+        for done, future in enumerate(as_completed(futures), start=1):
+            try:
+                result = future.result()
+            except BrokenProcessPool as exc:
+                # A worker died (e.g. killed for running out of memory); every unfinished file fails.
+                result = BatchResult(
+                    futures[future], None, time.perf_counter() - started, error=f"{type(exc).__name__}: {exc}"
+                )
+            results.append(result)
+            print(f"[{done}/{len(inputs)}] {result.status:<7} {result.input_path.name} ({result.seconds:.1f}s)")
+
+    results.sort(key=lambda result: inputs.index(result.input_path))
+    _print_batch_summary(results)
+    return 0 if all(result.error is None for result in results) else 1
+
+
+def collect_batch_inputs(patterns: Sequence[str]) -> List[Path]:
+    """Expand directories and glob patterns into a sorted, de-duplicated list of workbooks."""
+    found: Dict[Path, None] = {}
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            candidates = sorted(path.glob("*.xlsx"))
+        else:
+            candidates = sorted(Path(match) for match in glob.glob(pattern, recursive=True))
+        for candidate in candidates:
+            # Skip Excel's "~$" lock files left next to open workbooks.
+            if candidate.is_file() and candidate.suffix.lower() == ".xlsx" and not candidate.name.startswith("~$"):
+                found.setdefault(candidate.resolve(), None)
+    return list(found)
+
+
+def _run_batch_item(input_path: Path, args: argparse.Namespace) -> BatchResult:
+    # Runs in a worker process; any failure is reported for this file only.
+    started = time.perf_counter()
+    if args.section_cache is not None:
+        # One cache file per workbook, so parallel jobs never overwrite each other's entries.
+        path_digest = hashlib.sha256(str(input_path).encode("utf-8")).hexdigest()[:12]
+        cache_path = args.section_cache / f"{input_path.stem}-{path_digest}.pkl"
+        args = argparse.Namespace(**{**vars(args), "section_cache": cache_path})
+    try:
+        output_path, report = transform_file(
+            str(input_path),
+            args,
+            output_dir=args.out,
+            output_basename=f"{config.OUTPUT_FILE_BASENAME}_{input_path.stem}",
+        )
+    except Exception as exc:
+        logger.exception("Batch transformation failed for %s", input_path)
+        return BatchResult(input_path, None, time.perf_counter() - started, error=f"{type(exc).__name__}: {exc}")
+
+    validation = report["summary"]["overall_status"] if report is not None else None
+    return BatchResult(input_path, output_path, time.perf_counter() - started, validation=validation)
+
+
+def _print_batch_summary(results: Sequence[BatchResult]) -> None:
+    rows = [
+        (
+            result.input_path.name,
+            result.status,
+            f"{result.seconds:.1f}s",
+            result.validation or "-",
+            result.error or (result.output_path.name if result.output_path is not None else "-"),
+        )
+        for result in results
+    ]
+    headers = ("Workbook", "Status", "Time", "Validation", "Output / error")
+    widths = [max(len(str(row[column])) for row in rows + [headers]) for column in range(len(headers))]
+    print()
+    for row in [headers, tuple("-" * width for width in widths)] + rows:
+        print("  ".join(str(value).ljust(width) for value, width in zip(row, widths)).rstrip())
+
+    failed = sum(result.error is not None for result in results)
+    print(f"\n{len(results) - failed} succeeded, {failed} failed")
+
+
+def _check_excel_capacity(source, *, reader_backend: str, engine: str) -> None:
+    """Raise ``ValueError`` up front when an output sheet would not fit in one worksheet."""
+    estimates = estimate_output_rows(source, reader_backend=reader_backend, engine=engine)
+    for spec in config.SHEET_SPECS:
+        if spec.sheet_name in estimates:
+            plan_sheet_parts(spec.output_sheet_name, estimates[spec.sheet_name], rollover=False)
+
+
 def _show_message(title: str, message: str, *, severity: str = "info") -> None:
     if not _TK_AVAILABLE:
         return
@@ -9,15 +9,17 @@ import sys
 from datetime import datetime
 
 from cej_transformer.logging_utils import configure_logging
-from cej_transformer.validator import validate_output
+from cej_transformer.validator import validate_details, validate_output
 
 
 def main() -> None:
-    if len(sys.argv) != 3:
-        print("Usage: python validation_script.py <input_excel_file> <output_excel_file>")
+    args = [arg for arg in sys.argv[1:] if arg != "--details"]
+    detailed = len(args) != len(sys.argv) - 1
+    if len(args) != 2:
+        print("Usage: python validation_script.py <input_excel_file> <output_excel_file> [--details]")
         sys.exit(1)
 
-    input_file, output_file = sys.argv[1:3]
+    input_file, output_file = args
     if not os.path.exists(input_file):
         print(f"Error: Input file '{input_file}' not found")
         sys.exit(1)
@@ -42,8 +44,19 @@ def main() -> None:
         json.dump(report, json_file, indent=2)
 
     print(f"\nDetailed validation report saved to: {report_filename}")
+
+    passed = report["summary"]["overall_status"] == "PASS"
+    if detailed:
+        mismatches = validate_details(input_file, output_file)
+        print(f"Stage / aspect ratio / language mismatches: {len(mismatches)}")
+        if not mismatches.empty:
+            details_filename = f"validation_details_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            mismatches.to_csv(details_filename, index=False)
+            print(f"Mismatching combinations saved to: {details_filename}")
+        passed = passed and mismatches.empty
+
     print(f"Validation log saved to: {log_filename}")
-    sys.exit(0 if report["summary"]["overall_status"] == "PASS" else 1)
+    sys.exit(0 if passed else 1)
 
 
 def quick_validate(input_file: str, output_file: str) -> bool:
@@ -1,19 +1,21 @@
 import base64
 import logging
-import os
-import tempfile
 import traceback
 from datetime import datetime
 from io import BytesIO, StringIO
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
 
 import pandas as pd
 import streamlit as st
 from PIL import Image
 
 from cej_transformer import config
+from cej_transformer.cache import SheetCache, config_fingerprint, workbook_digest
 from cej_transformer.logging_utils import configure_logging
+from cej_transformer.results import partition_by_platform
 from cej_transformer.transformer import process_workbook
+from cej_transformer.writer import plan_sheet_parts, write_excel_sheets
 
 
 # --- Page Configuration (Must be the FIRST Streamlit command) ---
@@ -74,6 +76,51 @@ def setup_streamlit_logging():
     return log_stream_for_ui, app_logger
 
 
+@st.cache_resource
+def _sheet_cache() -> SheetCache:
+    """Shared on-disk cache so re-uploads of the same workbook skip Excel parsing."""
+    return SheetCache()
+
+
+# Results are cached per (upload SHA-256, config fingerprint, output mode). Leading-underscore
+# arguments are excluded from Streamlit's cache key, so the upload itself is never hashed.
+@st.cache_data(
+    max_entries=config.STREAMLIT_CACHE_MAX_ENTRIES, ttl=config.STREAMLIT_CACHE_TTL_SECONDS, show_spinner=False
+)
+def _transform_upload(
+    upload_digest: str, fingerprint: str, output_mode: str, _upload: BytesIO
+) -> Dict[str, Optional[pd.DataFrame]]:
+    return process_workbook(
+        _upload, cache=_sheet_cache(), output_mode=output_mode, parallel=config.STREAMLIT_PARALLEL_SHEETS
+    )
+
+
+def _workbook_bytes(sheets: List[Tuple[str, pd.DataFrame]]) -> bytes:
+    """xlsx payload holding ``sheets`` (one platform of a sheet, or every output sheet)."""
+    payload = BytesIO()
+    write_excel_sheets(sheets, payload)
+    return payload.getvalue()
+
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def _lazy_download_button(label: str, *, build: Callable[[], bytes], file_name: str, key: str) -> None:
+    """Show a download button whose payload is only built after the user asks for it.
+
+    Until "Prepare" is clicked nothing is serialized; afterwards the bytes are kept in this
+    session's state, so reruns reuse them until the next upload is transformed.
+    """
+    prepared: Dict[str, bytes] = st.session_state.setdefault("prepared_downloads", {})
+    payload = prepared.get(key)
+    if payload is None:
+        if not st.button(f"Prepare {label}", key=f"prepare_{key}"):
+            return
+        with st.spinner("Building Excel file..."):
+            payload = prepared[key] = build()
+    st.download_button(label=label, data=payload, file_name=file_name, mime=XLSX_MIME, key=key)
+
+
 def run_streamlit_app():
     st.title(f"CEJ Master Spec Sheet Transformer v{config.VERSION}")
 
@@ -91,6 +138,11 @@ def run_streamlit_app():
         st.warning("ALL stage expansion is enabled: rows with Funnel Stage 'ALL' will emit Awareness, Consideration, and Purchase.")
 
     uploaded_file = st.file_uploader("Choose an Excel file", type="xlsx")
+    aggregate_quantities = st.checkbox(
+        "Aggregate identical creatives into a Quantity column",
+        value=False,
+        help="Emit each distinct Platform/Stage/Format/Duration/Aspect Ratio/Language combination once.",
+    )
     if uploaded_file is not None:
         if st.button("Transform Excel Data"):
             log_stream, logger_instance = setup_streamlit_logging()
@@ -99,25 +151,25 @@ def run_streamlit_app():
             logger_instance.info("STREAMLIT_APP: Processing started.")
 
             with st.spinner("Processing your Excel file... Please wait."):
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp_file:
-                    tmp_file.write(uploaded_file.getvalue())
-                    tmp_file_path = tmp_file.name
-
                 try:
-                    results_by_sheet_type = process_workbook(tmp_file_path)
+                    # UploadedFile is an in-memory BytesIO; hand it over without a temp-file round trip.
+                    output_mode = config.OUTPUT_MODE_QUANTITY if aggregate_quantities else config.OUTPUT_MODE_ROWS
+                    upload_digest = workbook_digest(uploaded_file)
+                    fingerprint = config_fingerprint()
+                    logger_instance.info("STREAMLIT_APP: Upload digest %s (config %s).", upload_digest[:12], fingerprint)
+                    results_by_sheet_type = _transform_upload(upload_digest, fingerprint, output_mode, uploaded_file)
                     st.session_state["results_by_sheet_type"] = results_by_sheet_type
+                    st.session_state["result_key"] = f"{upload_digest}:{fingerprint}:{output_mode}"
                     st.session_state["file_processed"] = True
                 except Exception as exc:
                     logger_instance.error("An error occurred during processing: %s", exc)
                     logger_instance.error(traceback.format_exc())
                     st.error(f"An error occurred: {exc}")
                 finally:
-                    if os.path.exists(tmp_file_path):
-                        os.remove(tmp_file_path)
-
                     log_contents = log_stream.getvalue()
                     st.session_state["log_contents"] = log_contents
 
+                st.session_state.pop("prepared_downloads", None)
                 st.session_state.pop("df_transformed", None)
                 st.session_state.pop("platform_dfs", None)
                 st.session_state.pop("platform_counts", None)
@@ -133,6 +185,7 @@ def run_streamlit_app():
             st.text_area("Log Details", log_text_to_display, height=200, key="log_display_area_diagnostics")
 
         results_data = st.session_state.get("results_by_sheet_type")
+        result_key = st.session_state.get("result_key", "")
         any_data_processed = False
 
         if results_data:
@@ -157,33 +210,42 @@ def run_streamlit_app():
                 st.subheader(sheet_title)
                 if df_current_sheet is not None and not df_current_sheet.empty:
                     any_data_processed = True
-                    st.write(f"Total unique creative combinations generated: {len(df_current_sheet)}")
+                    has_quantity = config.OUTPUT_QUANTITY_COLUMN in df_current_sheet.columns
+                    if has_quantity:
+                        st.write(
+                            f"Total creatives generated: {int(df_current_sheet[config.OUTPUT_QUANTITY_COLUMN].sum())} "
+                            f"across {len(df_current_sheet)} unique combinations"
+                        )
+                    else:
+                        st.write(f"Total unique creative combinations generated: {len(df_current_sheet)}")
                     st.dataframe(df_current_sheet.head(10))
 
                     st.markdown("#### Platform-Specific Breakdowns & Downloads")
-                    platforms_in_sheet = df_current_sheet["Platform"].unique()
-                    if len(platforms_in_sheet) > 0:
-                        for platform_name in sorted(list(platforms_in_sheet)):
-                            df_platform_specific = df_current_sheet[df_current_sheet["Platform"] == platform_name]
-                            count = len(df_platform_specific)
+                    platform_partitions = partition_by_platform(df_current_sheet)
+                    if platform_partitions:
+                        for partition in platform_partitions:
+                            platform_name = partition.platform_name
+                            df_platform_specific = partition.frame
+                            count = partition.count
                             expander_key = f"expander_{sheet_key}_{platform_name.replace(' ', '_')}"
-                            button_key = f"button_dl_{sheet_key}_{platform_name.replace(' ', '_')}"
+                            button_key = f"button_dl_{result_key}_{sheet_key}_{platform_name.replace(' ', '_')}"
 
                             platform_name_display = platform_name.upper()
 
-                            with st.expander(f"{platform_name_display}: {count} combinations"):
+                            if has_quantity:
+                                # In quantity mode the partition count sums Quantity, i.e. creatives.
+                                count_label = (
+                                    f"{count} creatives across {len(df_platform_specific)} unique combinations"
+                                )
+                            else:
+                                count_label = f"{count} combinations"
+
+                            with st.expander(f"{platform_name_display}: {count_label}"):
                                 st.dataframe(df_platform_specific.head(10))
-                                platform_excel_bytes = BytesIO()
-                                with pd.ExcelWriter(platform_excel_bytes, engine="openpyxl") as writer_platform:
-                                    df_platform_specific.to_excel(
-                                        writer_platform, index=False, sheet_name=platform_name[:30]
-                                    )
-                                platform_excel_bytes.seek(0)
-                                st.download_button(
-                                    label=f"Download {platform_name_display} Data (Excel)",
-                                    data=platform_excel_bytes,
+                                _lazy_download_button(
+                                    f"Download {platform_name_display} Data (Excel)",
+                                    build=lambda: _workbook_bytes([(platform_name[:30], df_platform_specific)]),
                                     file_name=f"{platform_name}_{sheet_key.replace(' ', '_').lower()}_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                                     key=button_key,
                                 )
                     else:
@@ -196,31 +258,25 @@ def run_streamlit_app():
 
             if any_data_processed:
                 st.subheader("Download All Processed Data (Combined Excel)")
-                output_excel_combined = BytesIO()
-                with pd.ExcelWriter(output_excel_combined, engine="openpyxl") as writer_combined:
-                    df_dual_lang_output = results_data.get(config.DUAL_LANG_INPUT_SHEET_NAME)
-                    if df_dual_lang_output is not None and not df_dual_lang_output.empty:
-                        df_dual_lang_output.to_excel(
-                            writer_combined, sheet_name=config.OUTPUT_SHEET_NAME_DUAL_LANG, index=False
-                        )
-
-                    df_single_lang_output = results_data.get(config.SINGLE_LANG_INPUT_SHEET_NAME)
-                    if df_single_lang_output is not None and not df_single_lang_output.empty:
-                        df_single_lang_output.to_excel(
-                            writer_combined, sheet_name=config.OUTPUT_SHEET_NAME_SINGLE_LANG, index=False
-                        )
-
-                output_excel_combined.seek(0)
-                if output_excel_combined.getbuffer().nbytes > 0:
-                    st.download_button(
-                        label="Download Combined Data (Excel)",
-                        data=output_excel_combined,
-                        file_name=f"{config.OUTPUT_FILE_BASENAME}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        key="download_combined_all",
+                combined_sheets = [
+                    (spec.output_sheet_name, results_data[spec.sheet_name])
+                    for spec in config.SHEET_SPECS
+                    if results_data.get(spec.sheet_name) is not None and not results_data[spec.sheet_name].empty
+                ]
+                split_sheets = [
+                    name for name, frame in combined_sheets if len(plan_sheet_parts(name, len(frame))) > 1
+                ]
+                if split_sheets:
+                    st.info(
+                        f"{', '.join(split_sheets)} exceed Excel's {config.EXCEL_MAX_ROWS:,}-row limit "
+                        "and are split across numbered sheets (_1, _2, ...)."
                     )
-                else:
-                    st.info("No data from any sheet was available to include in the combined download.")
+                _lazy_download_button(
+                    "Download Combined Data (Excel)",
+                    build=lambda: _workbook_bytes(combined_sheets),
+                    file_name=f"{config.OUTPUT_FILE_BASENAME}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+                    key=f"download_combined_all_{result_key}",
+                )
             else:
                 st.info("No data was transformed from any sheet. Nothing to download.")
 
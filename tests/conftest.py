@@ -0,0 +1,54 @@
+import pytest
+from openpyxl import Workbook
+
+from cej_transformer import config
+
+MAIN_HEADER = [None, None, "Funnel Stage", "Format", "Duration", "Aspect Ratio", None, "Languages", None, "TOTAL"]
+SUB_HEADER = [None, None, None, None, None, "16:9", "9:16", "EN", "FR", None]
+
+
+@pytest.fixture(autouse=True)
+def _run_in_tmp_path(tmp_path, monkeypatch):
+    # configure_logging writes its log file to the working directory.
+    monkeypatch.chdir(tmp_path)
+
+
+def _tracker_rows(platforms):
+    rows = [[None] * 10 for _ in range(4)]
+    for platform_name, data_rows in platforms:
+        rows += [[None, platform_name], [], MAIN_HEADER, SUB_HEADER]
+        rows += data_rows
+        rows += [[], []]
+    return rows
+
+
+@pytest.fixture
+def tracker_workbook(tmp_path):
+    """Path to a small tracker workbook with both sheets, written by openpyxl."""
+    platforms = [
+        (
+            "YouTube",
+            [
+                [None, None, "Awareness", "Video", "15s", 2, 1, "x", None, 3],
+                [None, None, "ALL", "Video", 30, 1.0, None, "x", "x", 1],
+                [None, None, "Purchase", "Static", None, None, "3", None, "x", "bad"],
+            ],
+        ),
+        (
+            "META",
+            [
+                [None, None, "Consideration", "Carousel", "6s", 4, 2, None, "x", 6],
+                [None, None, "Awareness", "Video", "15s", None, None, "x", None, None],
+                [None, None, "Retention", "Static", None, 1, None, "x"],  # trailing cells left empty
+            ],
+        ),
+    ]
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for sheet_name in (config.DUAL_LANG_INPUT_SHEET_NAME, config.SINGLE_LANG_INPUT_SHEET_NAME):
+        worksheet = workbook.create_sheet(sheet_name)
+        for row in _tracker_rows(platforms):
+            worksheet.append(row)
+    path = tmp_path / "tracker.xlsx"
+    workbook.save(path)
+    return path
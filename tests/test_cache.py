@@ -0,0 +1,78 @@
+import threading
+
+import pandas as pd
+
+from cej_transformer import config
+from cej_transformer.cache import SectionResultCache, SheetCache
+
+
+def _sheets():
+    return {config.DUAL_LANG_INPUT_SHEET_NAME: pd.DataFrame([["a", 1]]), config.SINGLE_LANG_INPUT_SHEET_NAME: None}
+
+
+def test_stale_version_sweep_keeps_unrelated_directories(tmp_path):
+    (tmp_path / "important_dir").mkdir()
+    (tmp_path / "sheets-0.0.1").mkdir()
+
+    cache = SheetCache(tmp_path)
+
+    assert (tmp_path / "important_dir").is_dir()
+    assert not (tmp_path / "sheets-0.0.1").exists()
+    assert cache.directory.is_dir()
+
+
+def test_entries_are_keyed_by_engine(tmp_path):
+    cache = SheetCache(tmp_path)
+    cache.put("digest", _sheets(), engine=config.READER_ENGINE_OPENPYXL)
+
+    names = [config.DUAL_LANG_INPUT_SHEET_NAME]
+    assert cache.get("digest", names, engine=config.READER_ENGINE_CALAMINE) is None
+    cached = cache.get("digest", names, engine=config.READER_ENGINE_OPENPYXL)
+    expected = _sheets()[config.DUAL_LANG_INPUT_SHEET_NAME]
+    pd.testing.assert_frame_equal(cached[config.DUAL_LANG_INPUT_SHEET_NAME], expected)
+
+
+def test_concurrent_puts_of_one_digest(tmp_path):
+    cache = SheetCache(tmp_path, max_bytes=1)
+    errors = []
+
+    def put():
+        try:
+            for _ in range(20):
+                cache.put("digest", _sheets(), engine=config.READER_ENGINE_OPENPYXL)
+        except Exception as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=put) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert not list(cache.directory.glob("*.tmp"))
+
+
+def test_unwritable_cache_is_a_miss(tmp_path):
+    cache = SheetCache(tmp_path)
+    cache.directory.rmdir()
+
+    cache.put("digest", _sheets(), engine=config.READER_ENGINE_OPENPYXL)
+
+    assert cache.get("digest", [config.DUAL_LANG_INPUT_SHEET_NAME], engine=config.READER_ENGINE_OPENPYXL) is None
+
+
+def test_section_cache_is_bounded_by_pickled_size():
+    entry = ("x" * 1000, [], 0)
+    cache = SectionResultCache(max_bytes=2500)
+
+    for key in ("a", "b", "c"):
+        cache.put(key, entry)
+
+    assert len(cache) == 2
+    assert cache.get("a") is None
+    assert cache.total_bytes <= 2500
+
+    cache.put("huge", ("x" * 5000, [], 0))
+    assert cache.get("huge") is None
+    assert len(cache) == 2
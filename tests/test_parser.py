@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cej_transformer.parser import ColumnSpec, coerce_numeric_columns, iter_section_blocks, iter_streamed_section_blocks
+
+MAIN_HEADER = [None, None, "Funnel Stage", "Format", "Duration", "Aspect Ratio", None, "Languages", None, "TOTAL"]
+SUB_HEADER = [None, None, None, None, None, "16:9", "9:16", "EN", "FR", None]
+BLANK = [None] * 10
+
+
+def _title(platform_name):
+    return [None, platform_name] + [None] * 8
+
+
+def _data(stage):
+    return [None, None, stage, "Video", "15s", 1, None, "x", None, 1]
+
+
+def _sheet(rows):
+    return pd.DataFrame(rows, dtype=object).fillna(np.nan)
+
+
+def _stream(sheet):
+    return ((row_idx, list(values)) for row_idx, values in enumerate(sheet.itertuples(index=False)))
+
+
+def _sections(blocks):
+    return [(section.platform_name, section.data_row_start, section.data_row_end) for section, _ in blocks]
+
+
+@pytest.mark.parametrize("is_dual_language", [True, False])
+def test_streamed_sections_match_frame_after_skipped_section(is_dual_language):
+    unresolvable_header = list(MAIN_HEADER)
+    unresolvable_header[5] = "Unknown"
+    sheet = _sheet(
+        [BLANK] * 4
+        + [_title("YouTube"), BLANK, unresolvable_header, SUB_HEADER]
+        # This header sits inside the rows skipped after the unresolvable section above.
+        + [_title("Amazon"), BLANK, MAIN_HEADER, SUB_HEADER, _data("Awareness"), _data("ALL")]
+        + [BLANK, BLANK, _title("META"), BLANK, MAIN_HEADER, SUB_HEADER, _data("Purchase"), _data("ALL")]
+    )
+
+    frame_blocks = list(iter_section_blocks(sheet, is_dual_language=is_dual_language))
+    streamed_blocks = list(iter_streamed_section_blocks(_stream(sheet), is_dual_language=is_dual_language))
+
+    assert _sections(frame_blocks) == [("META", 20, 22)]
+    assert _sections(streamed_blocks) == _sections(frame_blocks)
+    for (_, frame_rows), (_, streamed_rows) in zip(frame_blocks, streamed_blocks):
+        pd.testing.assert_frame_equal(
+            streamed_rows.reset_index(drop=True), frame_rows.reset_index(drop=True), check_dtype=False
+        )
+
+
+def test_coercion_issues_are_in_sheet_order():
+    rows = _sheet([[None, None, "Awareness", "Video", "15s", "a", "b", None, None, "c"]] * 2)
+    rows.index = [7, 8]
+    columns = [ColumnSpec(5, "16:9"), ColumnSpec(6, "9:16")]
+
+    _, issues = coerce_numeric_columns(rows, columns)
+
+    located = [(issue.row_idx, issue.column_name) for issue in issues]
+    assert located == [(7, "16:9"), (7, "9:16"), (8, "16:9"), (8, "9:16")]
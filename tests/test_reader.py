@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+from cej_transformer import config, process_workbook
+from cej_transformer.reader import available_engines
+
+
+@pytest.mark.skipif(
+    config.READER_ENGINE_CALAMINE not in available_engines(), reason="python-calamine is not installed"
+)
+@pytest.mark.parametrize("output_mode", config.OUTPUT_MODES)
+def test_calamine_matches_openpyxl(tracker_workbook, output_mode):
+    calamine = process_workbook(tracker_workbook, engine=config.READER_ENGINE_CALAMINE, output_mode=output_mode)
+    openpyxl = process_workbook(tracker_workbook, engine=config.READER_ENGINE_OPENPYXL, output_mode=output_mode)
+
+    assert list(calamine) == list(openpyxl)
+    for sheet_name, frame in openpyxl.items():
+        assert not frame.empty
+        pd.testing.assert_frame_equal(calamine[sheet_name], frame)
+
+
+@pytest.mark.parametrize("output_mode", config.OUTPUT_MODES)
+@pytest.mark.parametrize("expansion", config.EXPANSION_ENGINES)
+def test_stream_reader_matches_frame_reader(tracker_workbook, expansion, output_mode):
+    # The tracker workbook has a data row whose trailing cells are empty, which
+    # read-only openpyxl returns as a short tuple.
+    options = dict(expansion=expansion, output_mode=output_mode)
+    streamed = process_workbook(tracker_workbook, reader_backend=config.READER_BACKEND_STREAM, **options)
+    framed = process_workbook(tracker_workbook, reader_backend=config.READER_BACKEND_FRAME, **options)
+
+    assert list(streamed) == list(framed)
+    for sheet_name, frame in framed.items():
+        pd.testing.assert_frame_equal(streamed[sheet_name], frame)
@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+
+from cej_transformer import (
+    SectionResultCache,
+    WorkbookSession,
+    config,
+    iter_transformed_batches,
+    iter_transformed_records,
+    open_workbook,
+    process_workbook,
+)
+
+
+def test_incremental_run_matches_full_run(tracker_workbook, tmp_path):
+    section_cache = SectionResultCache()
+    full = process_workbook(tracker_workbook)
+    first = process_workbook(tracker_workbook, section_cache=section_cache)
+
+    cache_path = tmp_path / "sections.pkl"
+    section_cache.save(cache_path)
+    second = process_workbook(tracker_workbook, section_cache=SectionResultCache.load(cache_path))
+
+    assert len(section_cache) == 4
+    for sheet_name, frame in full.items():
+        pd.testing.assert_frame_equal(first[sheet_name], frame)
+        pd.testing.assert_frame_equal(second[sheet_name], frame)
+
+
+def test_incremental_run_picks_up_edited_cells(tracker_workbook):
+    section_cache = SectionResultCache()
+    session = open_workbook(tracker_workbook)
+    process_workbook(session, section_cache=section_cache)
+
+    sheets = {spec.sheet_name: session.sheet(spec.sheet_name) for spec in config.SHEET_SPECS}
+    edited = sheets[config.DUAL_LANG_INPUT_SHEET_NAME].copy()
+    edited.iat[8, 5] = 5  # first YouTube row, 16:9 ticks
+    sheets[config.DUAL_LANG_INPUT_SHEET_NAME] = edited
+    edited_session = WorkbookSession(session.source, sheets)
+
+    incremental = process_workbook(edited_session, section_cache=section_cache)
+
+    assert len(section_cache) == 5
+    for sheet_name, frame in process_workbook(edited_session).items():
+        pd.testing.assert_frame_equal(incremental[sheet_name], frame)
+
+
+def test_streaming_iterators_match_process_workbook(tracker_workbook):
+    expected = process_workbook(tracker_workbook)
+
+    records = {}
+    for spec, record in iter_transformed_records(tracker_workbook):
+        records.setdefault(spec.sheet_name, []).append(record)
+    batches = {}
+    for spec, batch in iter_transformed_batches(tracker_workbook, batch_size=2):
+        assert len(batch) <= 2
+        batches.setdefault(spec.sheet_name, []).append(batch)
+
+    assert list(records) == list(batches) == list(expected)
+    for spec in config.SHEET_SPECS:
+        frame = expected[spec.sheet_name]
+        from_records = pd.DataFrame(records[spec.sheet_name]).reindex(columns=frame.columns)
+        from_batches = pd.concat(batches[spec.sheet_name], ignore_index=True)
+        pd.testing.assert_frame_equal(from_records, frame, check_dtype=False)
+        pd.testing.assert_frame_equal(from_batches, frame)
+
+
+@pytest.mark.parametrize("output_mode", config.OUTPUT_MODES)
+def test_vectorized_expansion_matches_records(tracker_workbook, output_mode):
+    session = open_workbook(tracker_workbook)
+    records = process_workbook(session, expansion=config.EXPANSION_ENGINE_RECORDS, output_mode=output_mode)
+    vectorized = process_workbook(session, expansion=config.EXPANSION_ENGINE_VECTORIZED, output_mode=output_mode)
+
+    assert list(vectorized) == list(records)
+    for sheet_name, frame in records.items():
+        assert not frame.empty
+        pd.testing.assert_frame_equal(vectorized[sheet_name], frame)
@@ -0,0 +1,92 @@
+from io import BytesIO
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from cej_transformer import config, process_workbook, validate_details, validate_output, validate_results, validator
+from cej_transformer.reader import available_engines
+
+
+def _write_results(results, path):
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for spec in config.SHEET_SPECS:
+            results[spec.sheet_name].to_excel(writer, sheet_name=spec.output_sheet_name, index=False)
+    return path
+
+
+def _output_workbook():
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.title = config.OUTPUT_SHEET_NAME_DUAL_LANG
+    worksheet.append(["Platform", "Funnel Stage"])
+    for platform_name in ["YouTube", "YouTube", "META"]:
+        worksheet.append([platform_name, "Awareness"])
+    payload = BytesIO()
+    workbook.save(payload)
+    payload.seek(0)
+    return payload
+
+
+class _OldCalamineWorkbook:
+    """Stands in for python-calamine < 0.3, which lacks iter_rows and close."""
+
+    sheet_names = [config.OUTPUT_SHEET_NAME_DUAL_LANG]
+
+    @classmethod
+    def from_object(cls, source):
+        source.read()
+        return cls()
+
+    def get_sheet_by_name(self, sheet_name):
+        return object()
+
+
+@pytest.mark.skipif(
+    config.READER_ENGINE_CALAMINE not in available_engines(), reason="python-calamine is not installed"
+)
+def test_output_counts_fall_back_to_openpyxl_on_old_calamine(monkeypatch):
+    monkeypatch.setattr(validator, "CalamineWorkbook", _OldCalamineWorkbook)
+
+    counts = validator._collect_actual_counts(_output_workbook(), config.READER_ENGINE_CALAMINE)
+
+    assert counts == {config.OUTPUT_SHEET_NAME_DUAL_LANG: {"YouTube": 2, "META": 1}}
+
+
+@pytest.mark.parametrize("engine", available_engines())
+@pytest.mark.parametrize("output_mode", config.OUTPUT_MODES)
+def test_output_counts_fold_rollover_sheets(tracker_workbook, tmp_path, engine, output_mode):
+    results = process_workbook(tracker_workbook, output_mode=output_mode)
+    output_path = tmp_path / "output.xlsx"
+    with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
+        for spec in config.SHEET_SPECS:
+            frame = results[spec.sheet_name]
+            frame.iloc[:2].to_excel(writer, sheet_name=f"{spec.output_sheet_name}_1", index=False)
+            frame.iloc[2:].to_excel(writer, sheet_name=f"{spec.output_sheet_name}_2", index=False)
+
+    report = validate_output(tracker_workbook, output_path, engine=engine)
+
+    assert report["validation_results"] == validate_results(tracker_workbook, results)["validation_results"]
+    assert set(report["validation_results"]) == {spec.sheet_name for spec in config.SHEET_SPECS}
+
+
+@pytest.mark.parametrize("output_kind", ["dict", "xlsx"])
+@pytest.mark.parametrize("output_mode", config.OUTPUT_MODES)
+def test_validate_details_reports_edited_rows(tracker_workbook, tmp_path, output_mode, output_kind):
+    def as_output(frames):
+        return frames if output_kind == "dict" else _write_results(frames, tmp_path / "output.xlsx")
+
+    results = process_workbook(tracker_workbook, output_mode=output_mode)
+    assert validate_details(tracker_workbook, as_output(results)).empty
+
+    edited = results[config.DUAL_LANG_INPUT_SHEET_NAME].copy()
+    last_row = edited.index[-1]  # META Retention 16:9, one EN creative
+    assert edited.at[last_row, "Languages"] == "EN"
+    edited.at[last_row, "Languages"] = "FR"
+    results[config.DUAL_LANG_INPUT_SHEET_NAME] = edited
+
+    mismatches = validate_details(tracker_workbook, as_output(results))
+
+    assert list(mismatches.columns) == validator.DETAIL_COLUMNS
+    key = [config.DUAL_LANG_INPUT_SHEET_NAME, "META", "Retention", "16:9"]
+    assert mismatches.values.tolist() == [key + ["EN", 1, 0, -1], key + ["FR", 0, 1, 1]]
@@ -0,0 +1,38 @@
+import pytest
+
+from cej_transformer import config
+from cej_transformer.writer import plan_sheet_parts, rollover_base_name, rollover_sheet_name
+
+
+def test_frames_that_fit_keep_their_sheet_name():
+    assert plan_sheet_parts("Out", 4, max_rows=5) == [("Out", 0, 4)]
+    assert plan_sheet_parts("Out", 0, max_rows=5) == [("Out", 0, 0)]
+
+
+def test_oversized_frames_roll_over_into_numbered_sheets():
+    # Each worksheet holds max_rows - 1 data rows below the header.
+    assert plan_sheet_parts("Out", 9, max_rows=5) == [("Out_1", 0, 4), ("Out_2", 4, 8), ("Out_3", 8, 9)]
+
+
+def test_oversized_frames_raise_without_rollover():
+    with pytest.raises(ValueError, match="needs 5 rows"):
+        plan_sheet_parts("Out", 5, rollover=False, max_rows=5)
+
+
+def test_rollover_sheet_names_stay_within_excel_limit():
+    long_name = "x" * config.EXCEL_MAX_SHEET_NAME_LENGTH
+
+    assert rollover_sheet_name("Out", 2) == "Out_2"
+    assert rollover_sheet_name(long_name, 12) == "x" * (config.EXCEL_MAX_SHEET_NAME_LENGTH - 3) + "_12"
+    assert len(rollover_sheet_name(long_name, 12)) == config.EXCEL_MAX_SHEET_NAME_LENGTH
+
+
+def test_rollover_base_name_maps_parts_back_to_known_sheets():
+    base_names = [config.OUTPUT_SHEET_NAME_DUAL_LANG, config.OUTPUT_SHEET_NAME_SINGLE_LANG, "x" * 31]
+
+    assert rollover_base_name(config.OUTPUT_SHEET_NAME_DUAL_LANG, base_names) == config.OUTPUT_SHEET_NAME_DUAL_LANG
+    assert rollover_base_name(config.OUTPUT_SHEET_NAME_DUAL_LANG + "_2", base_names) == (
+        config.OUTPUT_SHEET_NAME_DUAL_LANG
+    )
+    assert rollover_base_name(rollover_sheet_name("x" * 31, 3), base_names) == "x" * 31
+    assert rollover_base_name("Other_2", base_names) == "Other_2"